@@ -0,0 +1,116 @@
+"""
+Benchmark de la etapa de extracción de contenido completo.
+
+Mide el coste de ContentExtractor sobre las páginas de `fixtures/` y el
+rendimiento de ContentEnricher descargando artículos de varios servidores
+locales (un host por puerto) que responden con una latencia simulada.
+
+Uso:
+    python benchmarks/bench_content_extraction.py [--articles 120] [--hosts 4] [--latency-ms 50]
+"""
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.content_enricher import ContentEnricher
+from src.services.content_extractor import ContentExtractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_fixtures():
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            fixtures[os.path.basename(path)] = f.read()
+    return fixtures
+
+
+def make_handler(fixtures, latency):
+    names = sorted(fixtures)
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        """Sirve /<n> con la página n-ésima de fixtures tras esperar `latency` segundos"""
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(latency)
+            index = int(self.path.strip('/') or 0)
+            body = fixtures[names[index % len(names)]]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return FixtureHandler
+
+
+def bench_extraction(fixtures, repeat):
+    extractor = ContentExtractor()
+    pages = [body.decode('utf-8') for body in fixtures.values()]
+
+    for (name, body), html in zip(fixtures.items(), pages):
+        text = extractor.extract(html) or ''
+        print(f"  {name:<24} {len(body):6d} bytes HTML -> {len(text):5d} caracteres de texto")
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            extractor.extract(html)
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(len(body) for body in fixtures.values()) * repeat
+    print(f"extracción: {elapsed / (repeat * len(pages)) * 1e6:.0f} µs/página, "
+          f"{total_bytes / elapsed / 1e6:.1f} MB/s")
+
+
+def bench_enricher(name, enricher, articles):
+    start = time.perf_counter()
+    enriched = enricher.enrich(articles)
+    elapsed = time.perf_counter() - start
+    extracted = sum(1 for article in enriched if article.get('content_hash'))
+    print(f"{name:<34} {len(articles) / elapsed:7.1f} páginas/s "
+          f"({extracted}/{len(articles)} extraídas, {elapsed:.2f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=120)
+    parser.add_argument('--hosts', type=int, default=4)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures()
+    bench_extraction(fixtures, args.repeat)
+
+    handler = make_handler(fixtures, args.latency_ms / 1000)
+    servers = [ThreadingHTTPServer(('127.0.0.1', 0), handler) for _ in range(args.hosts)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    articles = [
+        {'url': f"http://127.0.0.1:{servers[i % args.hosts].server_port}/{i}", 'content': ''}
+        for i in range(args.articles)
+    ]
+
+    bench_enricher('secuencial', ContentEnricher(max_workers=1, per_host_interval=0), articles)
+    bench_enricher('concurrente (2 por host, sin pausa)',
+                   ContentEnricher(max_workers=16, per_host_limit=2, per_host_interval=0), articles)
+    bench_enricher('concurrente (2 por host, 20 ms)',
+                   ContentEnricher(max_workers=16, per_host_limit=2, per_host_interval=0.02), articles)
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark del digest: tiempo hasta el primer token en modo bloqueante frente
+a modo streaming, usando un servidor local que imita la API de chat de OpenAI.
+
+Uso:
+    python benchmarks/bench_digest_streaming.py [--tokens 300] [--delay-ms 10] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openai
+from src.services.news_summarizer import NewsSummarizer
+
+SAMPLE_ARTICLES = [
+    {
+        'title': f'Noticia de prueba {i}',
+        'summary': 'Resumen breve de la noticia de prueba para el benchmark.',
+        'source_name': 'Fuente local',
+        'published_at': f'2025-06-10T{10 + i:02d}:00:00'
+    }
+    for i in range(5)
+]
+
+
+def make_handler(tokens, delay):
+    class MockChatHandler(BaseHTTPRequestHandler):
+        """Imita /v1/chat/completions generando `tokens` tokens con `delay` segundos entre cada uno"""
+
+        def log_message(self, format, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'{}')
+            words = [f'palabra{i} ' for i in range(tokens)]
+
+            if body.get('stream'):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.end_headers()
+                for word in words:
+                    time.sleep(delay)
+                    chunk = {
+                        'id': 'chatcmpl-bench',
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': body.get('model'),
+                        'choices': [{'index': 0, 'delta': {'content': word}, 'finish_reason': None}]
+                    }
+                    self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+                    self.wfile.flush()
+                self.wfile.write(b'data: [DONE]\n\n')
+                self.wfile.flush()
+                return
+
+            time.sleep(delay * tokens)
+            payload = json.dumps({
+                'id': 'chatcmpl-bench',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': body.get('model'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': ''.join(words)},
+                    'finish_reason': 'stop'
+                }]
+            }).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return MockChatHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tokens', type=int, default=300)
+    parser.add_argument('--delay-ms', type=float, default=10.0)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.tokens, args.delay_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = openai.OpenAI(api_key='bench', base_url=f'http://127.0.0.1:{server.server_port}/v1')
+    summarizer = NewsSummarizer(client=client)
+
+    blocking, ttft, streaming_total = [], [], []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        summarizer.generate_news_digest(SAMPLE_ARTICLES)
+        blocking.append((time.perf_counter() - start) * 1000)
+
+        metrics = {}
+        for _ in summarizer.stream_news_digest(SAMPLE_ARTICLES, metrics=metrics):
+            pass
+        ttft.append(metrics['time_to_first_token_ms'])
+        streaming_total.append(metrics['total_time_ms'])
+
+    server.shutdown()
+
+    print(f"tokens={args.tokens} delay={args.delay_ms} ms runs={args.runs}")
+    print(f"bloqueante   primer byte: {statistics.median(blocking):8.1f} ms (mediana)")
+    print(f"streaming    primer token: {statistics.median(ttft):8.1f} ms (mediana)")
+    print(f"streaming    total:        {statistics.median(streaming_total):8.1f} ms (mediana)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark del arranque de la aplicación con `python -X importtime`.
+
+Importa `src.main` en un proceso nuevo, sin credenciales de OpenAI, y muestra
+el tiempo total de importación y los módulos más costosos. Termina con error
+si la importación falla, si se cargan módulos que deben quedar diferidos
+(openai, bs4, feedparser, requests) o si se supera `--max-ms`.
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 5] [--max-ms 0] [--top 10]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = ('openai', 'bs4', 'feedparser', 'requests')
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def measure():
+    env = {key: value for key, value in os.environ.items() if not key.startswith('OPENAI_')}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import src.main'],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit("Error: no se pudo importar src.main")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), len(indent))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, default=0, help='límite del tiempo de importación (0 = sin límite)')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        modules = measure()
+        totals.append(modules['src.main'][1] / 1000)
+
+    total_ms = statistics.median(totals)
+    print(f"importación de src.main: {total_ms:.1f} ms (mediana de {args.runs})")
+
+    # Paquetes de primer nivel más costosos de la última ejecución
+    top_level = sorted(
+        ((cumulative, name) for name, (_, cumulative, indent) in modules.items() if indent == 3),
+        reverse=True
+    )[:args.top]
+    for cumulative, name in top_level:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    loaded = sorted(name for name in modules if name.split('.')[0] in DEFERRED_MODULES)
+    failed = False
+    if loaded:
+        roots = sorted({name.split('.')[0] for name in loaded})
+        print(f"Error: se cargan al arrancar módulos que deberían ser diferidos: {', '.join(roots)}")
+        failed = True
+    if args.max_ms and total_ms > args.max_ms:
+        print(f"Error: el arranque supera el límite de {args.max_ms:.0f} ms")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
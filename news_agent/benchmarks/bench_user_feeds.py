@@ -0,0 +1,143 @@
+"""
+Benchmark de los feeds personalizados: latencia que el fan-out añade a la
+ingesta (guardar un lote frente a guardarlo y repartirlo) y latencia de
+lectura del feed desde el timeline precalculado frente a la consulta filtrada
+con joins sobre toda la tabla de artículos, ordenada por fecha de publicación
+como `GET /api/news`.
+
+Uso:
+    python benchmarks/bench_user_feeds.py [--users 100000] [--sources 50] [--backlog 100000]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import insert
+from src.models.user import db, User, UserSubscription
+from src.models.news import NewsArticle, NewsSource
+from src.services.timeline_service import TimelineService
+
+
+def create_app(database_uri):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_BINDS'] = {'archive': 'sqlite://'}
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+    return app
+
+
+def seed(args, rng):
+    db.session.execute(insert(NewsSource), [
+        {'id': i, 'name': f'Fuente {i}', 'source_type': 'rss', 'is_active': True}
+        for i in range(1, args.sources + 1)
+    ])
+    db.session.execute(insert(User), [
+        {'id': i, 'username': f'usuario{i}', 'email': f'usuario{i}@example.com'}
+        for i in range(1, args.users + 1)
+    ])
+    db.session.execute(insert(UserSubscription), [
+        {'user_id': user_id, 'source_id': source_id}
+        for user_id in range(1, args.users + 1)
+        for source_id in rng.sample(range(1, args.sources + 1), args.subscriptions)
+    ])
+    # Histórico previo que no pasa por el fan-out, publicado en los últimos 30 días
+    now = datetime.utcnow()
+    db.session.execute(insert(NewsArticle), [
+        {
+            'title': f'Histórico {i}',
+            'source_name': f'Fuente {rng.randint(1, args.sources)}',
+            'published_at': now - timedelta(seconds=rng.randint(0, 30 * 86400))
+        }
+        for i in range(args.backlog)
+    ])
+    db.session.commit()
+
+
+def join_feed(user_id, page, per_page):
+    return NewsArticle.query.join(
+        NewsSource, NewsSource.name == NewsArticle.source_name
+    ).join(
+        UserSubscription, UserSubscription.source_id == NewsSource.id
+    ).filter(
+        UserSubscription.user_id == user_id
+    ).order_by(
+        NewsArticle.published_at.desc(), NewsArticle.id.desc()
+    ).offset((page - 1) * per_page).limit(per_page).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--sources', type=int, default=50)
+    parser.add_argument('--subscriptions', type=int, default=3, help='fuentes por usuario')
+    parser.add_argument('--backlog', type=int, default=100000, help='artículos previos')
+    parser.add_argument('--batches', type=int, default=5, help='lotes de ingesta (un artículo por fuente)')
+    parser.add_argument('--reads', type=int, default=200)
+    parser.add_argument('--page', type=int, default=1)
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--database', default='sqlite://')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    app = create_app(args.database)
+    service = TimelineService()
+
+    with app.app_context():
+        db.create_all()
+
+        start = time.perf_counter()
+        seed(args, rng)
+        print(f"datos iniciales: {args.users} usuarios, {args.sources} fuentes, "
+              f"{args.backlog} artículos ({time.perf_counter() - start:.1f} s)")
+
+        save_times = []
+        fan_out_times = []
+        for batch in range(args.batches):
+            articles = [
+                NewsArticle(title=f'Nueva {batch}-{i}', source_name=f'Fuente {i}',
+                            published_at=datetime.utcnow())
+                for i in range(1, args.sources + 1)
+            ]
+            start = time.perf_counter()
+            db.session.add_all(articles)
+            db.session.commit()
+            save_times.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            updated = service.fan_out(articles)
+            db.session.commit()
+            fan_out_times.append((time.perf_counter() - start) * 1000)
+
+        save_ms = statistics.median(save_times)
+        fan_out_ms = statistics.median(fan_out_times)
+        print(f"ingesta de un lote de {args.sources} artículos (mediana): guardar {save_ms:.0f} ms, "
+              f"fan-out a {updated} timelines {fan_out_ms:.0f} ms")
+        print(f"latencia añadida a POST /api/news/fetch por el fan-out: +{fan_out_ms:.0f} ms "
+              f"(x{(save_ms + fan_out_ms) / save_ms:.1f} sobre guardar)")
+
+        user_ids = [rng.randint(1, args.users) for _ in range(args.reads)]
+        for name, read in (
+            ('timeline', lambda uid: service.get_feed(uid, args.page, args.per_page)),
+            ('join', lambda uid: join_feed(uid, args.page, args.per_page)),
+        ):
+            times = []
+            for user_id in user_ids:
+                db.session.expire_all()
+                start = time.perf_counter()
+                read(user_id)
+                times.append((time.perf_counter() - start) * 1000)
+            times.sort()
+            print(f"lectura feed {name:<9} p50 {statistics.median(times):7.2f} ms  "
+                  f"p99 {times[int(len(times) * 0.99) - 1]:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
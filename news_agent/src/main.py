@@ -6,9 +6,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from flask import Flask, send_from_directory
 from flask_cors import CORS
 from src.models.user import db
-from src.models.news import NewsArticle, NewsSource
+from src.models.news import NewsArticle, NewsSource, NewsDigest, ArchivedArticle
+from src.models.migrations import migrate_database
 from src.routes.user import user_bp
 from src.routes.news import news_bp
+from src.services.archive_service import ArchiveService
+from src.services.factory import get_summary_queue
+from src.services.summary_queue import SummaryBudget
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
@@ -21,10 +25,37 @@ app.register_blueprint(news_bp, url_prefix='/api')
 
 # uncomment if you need to use database
 app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
+# Base de datos de archivo para las noticias antiguas
+app.config['SQLALCHEMY_BINDS'] = {
+    'archive': f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'archive.db')}"
+}
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['ENABLE_CONTENT_ENRICHMENT'] = os.environ.get('ENABLE_CONTENT_ENRICHMENT', '').lower() in ('1', 'true', 'yes')
+app.config['ARCHIVE_RETENTION_DAYS'] = int(os.environ.get('ARCHIVE_RETENTION_DAYS', ArchiveService.DEFAULT_RETENTION_DAYS))
+# Presupuesto de la cola de resúmenes: el diario se comparte entre procesos
+# (tabla summary_spend), los tokens por minuto se cuentan por proceso
+app.config['SUMMARY_TOKENS_PER_MINUTE'] = int(os.environ.get('SUMMARY_TOKENS_PER_MINUTE', SummaryBudget.DEFAULT_TOKENS_PER_MINUTE))
+app.config['SUMMARY_DAILY_BUDGET_USD'] = float(os.environ.get('SUMMARY_DAILY_BUDGET_USD', SummaryBudget.DEFAULT_DAILY_BUDGET_USD))
 db.init_app(app)
-with app.app_context():
-    db.create_all()
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Crea o actualiza el esquema de la base de datos"""
+    added = migrate_database()
+    print(f"Base de datos actualizada ({len(added)} columnas nuevas)")
+
+@app.cli.command('archive-news')
+def archive_news_command():
+    """Mueve al archivo las noticias más antiguas que ARCHIVE_RETENTION_DAYS"""
+    result = ArchiveService().run(retention_days=app.config['ARCHIVE_RETENTION_DAYS'])
+    print(f"Archivadas {result['archived']} noticias en {result['batches']} lotes")
+
+@app.cli.command('backfill-summaries')
+def backfill_summaries_command():
+    """Genera los resúmenes pendientes mientras quede presupuesto"""
+    result = get_summary_queue().backfill(limit=100)
+    db.session.commit()
+    print(f"Generados {result['generated']} resúmenes ({result['pending']} pendientes)")
 
 @app.route('/', defaults={'path': ''})
 @app.route('/<path:path>')
@@ -44,4 +75,6 @@ def serve(path):
 
 
 if __name__ == '__main__':
+    with app.app_context():
+        migrate_database()
     app.run(host='0.0.0.0', port=5000, debug=True)
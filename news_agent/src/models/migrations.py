@@ -0,0 +1,108 @@
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.schema import CreateIndex, CreateTable
+from src.models.user import db
+from src.models.news import NewsArticle, ArchivedArticle
+import logging
+from typing import List
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_database() -> List[str]:
+    """
+    Crea las tablas que falten y agrega a las tablas existentes las columnas e
+    índices nuevos de los modelos. Debe ejecutarse dentro de un contexto de
+    aplicación. Devuelve las columnas agregadas como "tabla.columna".
+    
+    En SQLite también recrea las tablas que ahora usan AUTOINCREMENT, para
+    que los ids de las filas borradas no se vuelvan a asignar.
+    """
+    db.create_all()
+    
+    added = []
+    for bind_key, metadata in db.metadatas.items():
+        engine = db.engines[bind_key]
+        inspector = inspect(engine)
+        
+        with engine.begin() as connection:
+            for table in metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                
+                for column in table.columns:
+                    if column.name in existing:
+                        continue
+                    
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    connection.execute(text(
+                        f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'
+                    ))
+                    added.append(f"{table.name}.{column.name}")
+                
+                # IF NOT EXISTS en lugar de checkfirst: la reflexión no ve los
+                # índices de expresión y los volvería a crear
+                for index in table.indexes:
+                    connection.execute(CreateIndex(index, if_not_exists=True))
+    
+                if _needs_autoincrement_rebuild(connection, table):
+                    _rebuild_sqlite_table(connection, table)
+                    logger.info(f"Tabla {table.name} recreada con AUTOINCREMENT")
+    
+    _reserve_archived_ids()
+    
+    if added:
+        logger.info(f"Columnas agregadas: {', '.join(added)}")
+    return added
+
+def _needs_autoincrement_rebuild(connection, table) -> bool:
+    if connection.dialect.name != 'sqlite' or not table.dialect_options['sqlite'].get('autoincrement'):
+        return False
+    
+    sql = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {'name': table.name}
+    ).scalar()
+    return sql is not None and 'AUTOINCREMENT' not in sql.upper()
+
+def _rebuild_sqlite_table(connection, table):
+    """
+    Recrea una tabla de SQLite con la definición actual del modelo y copia sus
+    filas: crear la tabla nueva, copiar, borrar la antigua y renombrar
+    """
+    temporary = table.to_metadata(MetaData(), name=f'_new_{table.name}')
+    columns = ', '.join(f'"{column.name}"' for column in table.columns)
+    
+    # Restos de una recreación interrumpida
+    connection.execute(text(f'DROP TABLE IF EXISTS "{temporary.name}"'))
+    connection.execute(CreateTable(temporary))
+    connection.execute(text(
+        f'INSERT INTO "{temporary.name}" ({columns}) SELECT {columns} FROM "{table.name}"'
+    ))
+    connection.execute(text(f'DROP TABLE "{table.name}"'))
+    connection.execute(text(f'ALTER TABLE "{temporary.name}" RENAME TO "{table.name}"'))
+    for index in table.indexes:
+        connection.execute(CreateIndex(index))
+
+def _reserve_archived_ids():
+    """
+    Evita que SQLite asigne a los artículos nuevos ids que ya están en el
+    archivo (p. ej. ids reutilizados antes de usar AUTOINCREMENT)
+    """
+    engine = db.engines[None]
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    max_archived = db.session.query(db.func.max(ArchivedArticle.id)).scalar()
+    if not max_archived:
+        return
+    
+    with engine.begin() as connection:
+        table = NewsArticle.__tablename__
+        updated = connection.execute(
+            text('UPDATE sqlite_sequence SET seq = MAX(seq, :seq) WHERE name = :name'),
+            {'seq': max_archived, 'name': table}
+        ).rowcount
+        if not updated:
+            connection.execute(
+                text('INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)'),
+                {'seq': max_archived, 'name': table}
+            )
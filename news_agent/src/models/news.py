@@ -1,8 +1,12 @@
 from src.models.user import db
 from datetime import datetime
+import json
+import zlib
 
 class NewsArticle(db.Model):
     __tablename__ = 'news_articles'
+    # Los ids no se reutilizan: el archivo y los timelines los guardan después de borrar la fila
+    __table_args__ = {'sqlite_autoincrement': True}
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(500), nullable=False)
@@ -15,9 +19,27 @@ class NewsArticle(db.Model):
     published_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Hash del texto completo extraído (ContentEnricher), para detectar duplicados
+    content_hash = db.Column(db.String(40), index=True)
+    
+    # Categoría de la fuente y palabras clave (separadas por comas) extraídas al capturar
+    category = db.Column(db.String(50), index=True)
+    keywords = db.Column(db.String(500))
+    
     # Campos para el resumen generado por IA
     summary = db.Column(db.Text)
     summary_generated_at = db.Column(db.DateTime)
+    # 'generated', 'fallback' (descripción en espera de un resumen), 'failed'
+    # (descripción tras agotar los reintentos) o 'skipped'
+    summary_status = db.Column(db.String(20), index=True)
+    summary_attempts = db.Column(db.Integer, default=0)
+    
+    @staticmethod
+    def normalize_category(category):
+        """Normaliza el nombre de una categoría para agrupar y suscribirse"""
+        if not category:
+            return None
+        return str(category).strip().lower()[:50] or None
     
     def to_dict(self):
         return {
@@ -29,11 +51,23 @@ class NewsArticle(db.Model):
             'url_to_image': self.url_to_image,
             'source_name': self.source_name,
             'author': self.author,
+            'category': self.category,
+            'keywords': self.keywords.split(',') if self.keywords else [],
             'published_at': self.published_at.isoformat() if self.published_at else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'summary': self.summary,
-            'summary_generated_at': self.summary_generated_at.isoformat() if self.summary_generated_at else None
+            'summary_generated_at': self.summary_generated_at.isoformat() if self.summary_generated_at else None,
+            'summary_status': self.summary_status
         }
+    
+    @classmethod
+    def retention_date(cls):
+        """Fecha con la que se decide el archivado: la de publicación o, si falta, la de captura"""
+        return db.func.coalesce(cls.published_at, cls.created_at)
+
+# Índice de expresión para que el archivado lea los artículos más antiguos
+# por índice en lugar de recorrer la tabla
+db.Index('ix_news_articles_retention_date', NewsArticle.retention_date())
 
 class NewsSource(db.Model):
     __tablename__ = 'news_sources'
@@ -44,6 +78,8 @@ class NewsSource(db.Model):
     source_type = db.Column(db.String(50))  # 'api' o 'scraping'
     api_key = db.Column(db.String(200))
     is_active = db.Column(db.Boolean, default=True)
+    # Peso de la fuente en la cola de resúmenes (1.0 = normal)
+    weight = db.Column(db.Float, default=1.0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -53,6 +89,152 @@ class NewsSource(db.Model):
             'url': self.url,
             'source_type': self.source_type,
             'is_active': self.is_active,
+            'weight': self.weight if self.weight is not None else 1.0,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+
+class NewsDigest(db.Model):
+    __tablename__ = 'news_digests'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    content = db.Column(db.Text, nullable=False)
+    articles_count = db.Column(db.Integer, default=0)
+    generated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Métricas de la generación en streaming
+    time_to_first_token_ms = db.Column(db.Float)
+    total_time_ms = db.Column(db.Float)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'content': self.content,
+            'articles_count': self.articles_count,
+            'generated_at': self.generated_at.isoformat() if self.generated_at else None,
+            'time_to_first_token_ms': self.time_to_first_token_ms,
+            'total_time_ms': self.total_time_ms
+        }
+
+class ArchivedArticle(db.Model):
+    """
+    Artículo antiguo movido fuera de `news_articles`. Vive en la base de datos
+    de archivo y guarda los campos de texto largos comprimidos con zlib.
+    """
+    __bind_key__ = 'archive'
+    __tablename__ = 'archived_articles'
+    
+    COMPRESSED_FIELDS = ('description', 'content', 'summary')
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(500), nullable=False)
+    url = db.Column(db.String(1000), index=True)
+    content_hash = db.Column(db.String(40), index=True)
+    url_to_image = db.Column(db.String(1000))
+    source_name = db.Column(db.String(200))
+    author = db.Column(db.String(200))
+    category = db.Column(db.String(50))
+    keywords = db.Column(db.String(500))
+    published_at = db.Column(db.DateTime, index=True)
+    created_at = db.Column(db.DateTime)
+    summary_generated_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # description, content y summary en JSON comprimido
+    payload = db.Column(db.LargeBinary)
+    
+    @classmethod
+    def from_article(cls, article):
+        payload = {field: getattr(article, field) for field in cls.COMPRESSED_FIELDS}
+        return cls(
+            id=article.id,
+            title=article.title,
+            url=article.url,
+            content_hash=article.content_hash,
+            url_to_image=article.url_to_image,
+            source_name=article.source_name,
+            author=article.author,
+            category=article.category,
+            keywords=article.keywords,
+            published_at=article.published_at,
+            created_at=article.created_at,
+            summary_generated_at=article.summary_generated_at,
+            payload=zlib.compress(json.dumps(payload).encode('utf-8'))
+        )
+    
+    def to_dict(self):
+        payload = json.loads(zlib.decompress(self.payload)) if self.payload else {}
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': payload.get('description'),
+            'content': payload.get('content'),
+            'url': self.url,
+            'url_to_image': self.url_to_image,
+            'source_name': self.source_name,
+            'author': self.author,
+            'category': self.category,
+            'keywords': self.keywords.split(',') if self.keywords else [],
+            'published_at': self.published_at.isoformat() if self.published_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'summary': payload.get('summary'),
+            'summary_generated_at': self.summary_generated_at.isoformat() if self.summary_generated_at else None,
+            'archived': True
+        }
+
+class TrendCounter(db.Model):
+    """
+    Contador de artículos por hora para una fuente, categoría o término.
+    Se actualiza al guardar artículos, de modo que las consultas de
+    tendencias no recorren `news_articles`.
+    """
+    __tablename__ = 'trend_counters'
+    __table_args__ = (
+        db.UniqueConstraint('dimension', 'key', 'bucket_start', name='uq_trend_counters_bucket'),
+        db.Index('ix_trend_counters_dimension_bucket', 'dimension', 'bucket_start'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String(20), nullable=False)  # 'source', 'category' o 'term'
+    key = db.Column(db.String(200), nullable=False)
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class TrendTotal(db.Model):
+    """
+    Total de artículos de una clave en una ventana móvil (las últimas
+    `window_hours` horas). Se suma al guardar artículos y se resta al salir
+    cada hora de la ventana, así el top-k es una lectura por índice.
+    """
+    __tablename__ = 'trend_totals'
+    __table_args__ = (
+        db.UniqueConstraint('dimension', 'window_hours', 'key', name='uq_trend_totals_key'),
+        db.Index('ix_trend_totals_ranking', 'dimension', 'window_hours', 'count'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    dimension = db.Column(db.String(20), nullable=False)
+    window_hours = db.Column(db.Integer, nullable=False)
+    key = db.Column(db.String(200), nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class TrendWindow(db.Model):
+    """
+    Primera hora incluida en los totales de cada ventana móvil
+    """
+    __tablename__ = 'trend_windows'
+    
+    window_hours = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    oldest_bucket = db.Column(db.DateTime, nullable=False)
+
+class SummarySpend(db.Model):
+    """
+    Consumo diario de la IA (día UTC) compartido por todos los procesos: la
+    cola de resúmenes reserva aquí el coste de cada petición antes de hacerla
+    """
+    __tablename__ = 'summary_spend'
+    
+    day = db.Column(db.Date, primary_key=True)
+    tokens = db.Column(db.Integer, nullable=False, default=0)
+    cost_usd = db.Column(db.Float, nullable=False, default=0.0)
+    requests = db.Column(db.Integer, nullable=False, default=0)
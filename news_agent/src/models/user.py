@@ -1,4 +1,6 @@
 from flask_sqlalchemy import SQLAlchemy
+from array import array
+from datetime import datetime
 
 db = SQLAlchemy()
 
@@ -16,3 +18,55 @@ class User(db.Model):
             'username': self.username,
             'email': self.email
         }
+
+class UserSubscription(db.Model):
+    __tablename__ = 'user_subscriptions'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
+    # Una suscripción es a una fuente o a una categoría
+    source_id = db.Column(db.Integer, db.ForeignKey('news_sources.id', ondelete='CASCADE'), index=True)
+    category = db.Column(db.String(50), index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'source_id': self.source_id,
+            'category': self.category,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class UserTimeline(db.Model):
+    """
+    Timeline precalculado de un usuario: ids de artículos en orden de captura
+    (id descendente), empaquetados como enteros sin signo de 4 bytes.
+    """
+    __tablename__ = 'user_timelines'
+
+    ITEM_SIZE = 4
+    MAX_LENGTH = 1000
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    article_ids = db.Column(db.LargeBinary, nullable=False, default=b'')
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @classmethod
+    def pack(cls, ids):
+        return array('I', ids[:cls.MAX_LENGTH]).tobytes()
+
+    @staticmethod
+    def unpack(data):
+        ids = array('I')
+        ids.frombytes(data or b'')
+        return ids.tolist()
+
+    def __len__(self):
+        return len(self.article_ids or b'') // self.ITEM_SIZE
+
+    def page(self, offset, limit):
+        """Devuelve `limit` ids a partir de `offset` sin decodificar el resto de la lista"""
+        start = offset * self.ITEM_SIZE
+        end = start + limit * self.ITEM_SIZE
+        return self.unpack(self.article_ids[start:end])
@@ -1,18 +1,29 @@
-from flask import Blueprint, request, jsonify
-from src.models.news import db, NewsArticle, NewsSource
-from src.services.news_fetcher import NewsFetcher
-from src.services.news_summarizer import NewsSummarizer
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from src.models.news import db, NewsArticle, NewsSource, NewsDigest
+from src.services.factory import get_content_enricher, get_news_fetcher, get_news_summarizer, get_summary_queue
+from src.services.timeline_service import TimelineService
+from src.services.archive_service import ArchiveService
+from src.services.keyword_extractor import KeywordExtractor
+from src.services.summary_queue import SummaryQueue
+from src.services.trend_service import TrendService
 from datetime import datetime, timedelta
+import json
 import logging
+import math
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 news_bp = Blueprint('news', __name__)
 
-# Instanciar servicios
-news_fetcher = NewsFetcher()
-news_summarizer = NewsSummarizer()
+# Instanciar servicios (el capturador y el resumidor se crean al primer uso)
+timeline_service = TimelineService()
+archive_service = ArchiveService()
+keyword_extractor = KeywordExtractor()
+trend_service = TrendService()
+
+# Resúmenes pendientes que se intentan generar después de cada captura
+BACKFILL_BATCH_SIZE = 10
 
 @news_bp.route('/news', methods=['GET'])
 def get_news():
@@ -78,7 +89,7 @@ def fetch_news():
             country = data.get('country', 'us')
             category = data.get('category')
             
-            articles = news_fetcher.fetch_from_newsapi(
+            articles = get_news_fetcher().fetch_from_newsapi(
                 api_key=api_key,
                 country=country,
                 category=category
@@ -92,7 +103,7 @@ def fetch_news():
                     'error': 'Se requiere rss_url para RSS'
                 }), 400
             
-            articles = news_fetcher.fetch_from_rss(rss_url)
+            articles = get_news_fetcher().fetch_from_rss(rss_url)
         
         elif source_type == 'scraping':
             url = data.get('url')
@@ -105,7 +116,7 @@ def fetch_news():
                     'error': 'Se requieren url y title_selector para scraping'
                 }), 400
             
-            articles = news_fetcher.scrape_website(url, title_selector, content_selector)
+            articles = get_news_fetcher().scrape_website(url, title_selector, content_selector)
         
         else:
             return jsonify({
@@ -120,43 +131,122 @@ def fetch_news():
                 'articles_saved': 0
             })
         
-        # Generar resúmenes para los artículos
-        articles_with_summaries = news_summarizer.summarize_multiple_articles(articles)
+        # Descartar los artículos ya guardados (por URL), en la tabla principal
+        # o en el archivo, antes de descargar páginas o generar resúmenes
+        existing_urls = archive_service.existing_urls(
+            article_data.get('url') for article_data in articles
+        )
+        new_articles = []
+        for article_data in articles:
+            url = article_data.get('url')
+            if url in existing_urls:
+                continue  # Saltar artículos duplicados
+            existing_urls.add(url)
+            new_articles.append(article_data)
+        
+        # Extraer el texto completo de cada artículo (etapa opcional)
+        if data.get('enrich_content', current_app.config.get('ENABLE_CONTENT_ENRICHMENT', False)):
+            new_articles = get_content_enricher().enrich(new_articles)
+            
+            # Descartar el mismo texto publicado con otra URL
+            existing_hashes = archive_service.existing_content_hashes(
+                article_data.get('content_hash') for article_data in new_articles
+            )
+            unique_articles = []
+            for article_data in new_articles:
+                content_hash = article_data.get('content_hash')
+                if content_hash:
+                    if content_hash in existing_hashes:
+                        continue
+                    existing_hashes.add(content_hash)
+                unique_articles.append(article_data)
+            new_articles = unique_articles
+        
+        # Palabras clave: se guardan y agrupan los artículos por tema en la cola de resúmenes
+        for article_data in new_articles:
+            article_data['keywords'] = keyword_extractor.extract(article_data)
+        
+        # Generar resúmenes por orden de prioridad dentro del presupuesto
+        # (sin credenciales de IA se guardan con el resumen de respaldo y
+        # quedan pendientes para el relleno)
+        try:
+            summary_queue = get_summary_queue()
+        except Exception as e:
+            logger.warning(f"Servicio de resúmenes no disponible: {str(e)}")
+            summary_queue = None
+            articles_with_summaries = new_articles
+            for article_data in articles_with_summaries:
+                article_data['summary'] = SummaryQueue.fallback_summary(article_data)
+                article_data['summary_status'] = 'fallback'
+        else:
+            articles_with_summaries = summary_queue.process(new_articles)
         
-        # Guardar artículos en la base de datos
-        saved_count = 0
+        # Guardar artículos en la base de datos, del más antiguo al más reciente:
+        # los ids (y el orden de los timelines) siguen la fecha de publicación
+        articles_with_summaries = sorted(
+            articles_with_summaries,
+            key=lambda article_data: (
+                article_data.get('published_at') is None,
+                article_data.get('published_at') or datetime.min
+            )
+        )
+        saved_articles = []
         for article_data in articles_with_summaries:
             try:
-                # Verificar si el artículo ya existe (por URL)
-                existing_article = NewsArticle.query.filter_by(
-                    url=article_data.get('url')
-                ).first()
-                
-                if existing_article:
-                    continue  # Saltar artículos duplicados
-                
                 # Crear nuevo artículo
                 article = NewsArticle(
                     title=article_data.get('title', ''),
                     description=article_data.get('description', ''),
                     content=article_data.get('content', ''),
                     url=article_data.get('url', ''),
+                    content_hash=article_data.get('content_hash'),
                     url_to_image=article_data.get('url_to_image', ''),
                     source_name=article_data.get('source_name', ''),
                     author=article_data.get('author', ''),
                     published_at=article_data.get('published_at'),
+                    category=NewsArticle.normalize_category(article_data.get('category') or data.get('category')),
+                    keywords=','.join(article_data['keywords']),
                     summary=article_data.get('summary'),
-                    summary_generated_at=article_data.get('summary_generated_at')
+                    summary_generated_at=article_data.get('summary_generated_at'),
+                    summary_status=article_data.get('summary_status'),
+                    summary_attempts=article_data.get('summary_attempts', 0)
                 )
                 
                 db.session.add(article)
-                saved_count += 1
+                saved_articles.append(article)
                 
             except Exception as e:
                 logger.error(f"Error al guardar artículo: {str(e)}")
                 continue
         
         db.session.commit()
+        saved_count = len(saved_articles)
+        
+        # Repartir los artículos nuevos a los timelines de los suscriptores
+        try:
+            timeline_service.fan_out(saved_articles)
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Error al actualizar timelines: {str(e)}")
+            db.session.rollback()
+        
+        # Actualizar los contadores de tendencias
+        try:
+            trend_service.record(saved_articles)
+            db.session.commit()
+        except Exception as e:
+            logger.error(f"Error al actualizar tendencias: {str(e)}")
+            db.session.rollback()
+        
+        # Con el presupuesto restante, resumir artículos aplazados por presupuesto
+        # (los reintentos de peticiones fallidas quedan para /news/summaries/backfill)
+        if summary_queue is not None:
+            try:
+                summary_queue.backfill(limit=BACKFILL_BATCH_SIZE, retry_failed=False)
+                db.session.commit()
+            except Exception as e:
+                logger.error(f"Error al generar resúmenes pendientes: {str(e)}")
+                db.session.rollback()
         
         return jsonify({
             'success': True,
@@ -169,30 +259,71 @@ def fetch_news():
         db.session.rollback()
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@news_bp.route('/news/trending', methods=['GET'])
+def get_trending():
+    """
+    Obtiene los términos, categorías y fuentes con más noticias en las últimas
+    horas (se redondea a la ventana precalculada que las cubre: 1, 6, 24, 72 o 168)
+    """
+    try:
+        hours = min(max(request.args.get('hours', 24, type=int), 1), 24 * 7)
+        limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+        
+        return jsonify({
+            'success': True,
+            'hours': trend_service.window_for(hours),
+            'terms': trend_service.top('term', hours, limit),
+            'categories': trend_service.top('category', hours, limit),
+            'sources': trend_service.top('source', hours, limit)
+        })
+        
+    except Exception as e:
+        logger.error(f"Error al obtener tendencias: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def _get_recent_articles_for_digest():
+    """
+    Obtiene las noticias que se usan para generar el digest
+    """
+    # Obtener las noticias más recientes (últimas 24 horas)
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    
+    recent_articles = NewsArticle.query.filter(
+        NewsArticle.published_at >= yesterday
+    ).order_by(NewsArticle.published_at.desc()).limit(10).all()
+    
+    if not recent_articles:
+        # Si no hay noticias recientes, usar las más recientes disponibles
+        recent_articles = NewsArticle.query.order_by(
+            NewsArticle.published_at.desc()
+        ).limit(5).all()
+    
+    # Convertir a diccionarios
+    return [article.to_dict() for article in recent_articles]
+
+def _sse_event(data, event=None):
+    """
+    Formatea un evento Server-Sent Events con datos JSON
+    """
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def _is_positive_int(value):
+    """
+    Indica si un valor del cuerpo JSON es un entero mayor que 0 (los booleanos no cuentan)
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
 @news_bp.route('/news/digest', methods=['GET'])
 def get_news_digest():
     """
     Genera un digest de las noticias más recientes
     """
     try:
-        # Obtener las noticias más recientes (últimas 24 horas)
-        yesterday = datetime.utcnow() - timedelta(days=1)
-        
-        recent_articles = NewsArticle.query.filter(
-            NewsArticle.published_at >= yesterday
-        ).order_by(NewsArticle.published_at.desc()).limit(10).all()
-        
-        if not recent_articles:
-            # Si no hay noticias recientes, usar las más recientes disponibles
-            recent_articles = NewsArticle.query.order_by(
-                NewsArticle.published_at.desc()
-            ).limit(5).all()
-        
-        # Convertir a diccionarios
-        articles_data = [article.to_dict() for article in recent_articles]
+        articles_data = _get_recent_articles_for_digest()
         
         # Generar digest
-        digest = news_summarizer.generate_news_digest(articles_data)
+        digest = get_news_summarizer().generate_news_digest(articles_data)
         
         return jsonify({
             'success': True,
@@ -205,13 +336,99 @@ def get_news_digest():
         logger.error(f"Error al generar digest: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@news_bp.route('/news/digest/stream', methods=['GET'])
+def stream_news_digest():
+    """
+    Genera un digest de las noticias más recientes y lo envía fragmento a
+    fragmento como Server-Sent Events. Al terminar se guarda en la base de
+    datos para poder reutilizarlo.
+    """
+    try:
+        articles_data = _get_recent_articles_for_digest()
+        summarizer = get_news_summarizer()
+    except Exception as e:
+        logger.error(f"Error al generar digest: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    def generate():
+        metrics = {}
+        parts = []
+        
+        for text in summarizer.stream_news_digest(articles_data, metrics=metrics):
+            parts.append(text)
+            yield _sse_event({'text': text})
+        
+        if 'error' in metrics:
+            yield _sse_event({'success': False, 'error': metrics['error']}, event='error')
+            return
+        
+        try:
+            digest = NewsDigest(
+                content=''.join(parts).strip(),
+                articles_count=len(articles_data),
+                generated_at=datetime.utcnow(),
+                time_to_first_token_ms=metrics.get('time_to_first_token_ms'),
+                total_time_ms=metrics.get('total_time_ms')
+            )
+            
+            # Sin noticias el texto es un aviso, no un digest: no se guarda
+            if articles_data:
+                db.session.add(digest)
+                db.session.commit()
+            
+            yield _sse_event({'success': True, 'digest': digest.to_dict()}, event='done')
+            
+        except Exception as e:
+            logger.error(f"Error al guardar digest: {str(e)}")
+            db.session.rollback()
+            yield _sse_event({'success': False, 'error': str(e)}, event='error')
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@news_bp.route('/news/digest/latest', methods=['GET'])
+def get_latest_digest():
+    """
+    Obtiene el último digest guardado
+    """
+    try:
+        digest = NewsDigest.query.order_by(NewsDigest.generated_at.desc()).first()
+        
+        if not digest:
+            return jsonify({
+                'success': False, 
+                'error': 'No hay digests guardados'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'digest': digest.to_dict()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error al obtener el último digest: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @news_bp.route('/news/<int:news_id>', methods=['GET'])
 def get_news_by_id(news_id):
     """
     Obtiene una noticia específica por ID
     """
     try:
-        article = NewsArticle.query.get_or_404(news_id)
+        # Si no está entre las noticias recientes se busca en el archivo
+        article = archive_service.get_article(news_id)
+        if article is None:
+            return jsonify({
+                'success': False, 
+                'error': 'Noticia no encontrada'
+            }), 404
+        
         return jsonify({
             'success': True,
             'news': article.to_dict()
@@ -221,6 +438,79 @@ def get_news_by_id(news_id):
         logger.error(f"Error al obtener noticia {news_id}: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@news_bp.route('/news/archive', methods=['POST'])
+def archive_news():
+    """
+    Mueve al archivo las noticias más antiguas que el límite de retención
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        retention_days = data.get('retention_days', ArchiveService.DEFAULT_RETENTION_DAYS)
+        batch_size = data.get('batch_size', ArchiveService.DEFAULT_BATCH_SIZE)
+        max_batches = data.get('max_batches', 10)
+        
+        for name, value in (('retention_days', retention_days), ('batch_size', batch_size),
+                            ('max_batches', max_batches)):
+            if not _is_positive_int(value):
+                return jsonify({'success': False, 'error': f'{name} debe ser un número entero mayor que 0'}), 400
+        batch_size = min(batch_size, 1000)
+        
+        result = archive_service.run(
+            retention_days=retention_days,
+            batch_size=batch_size,
+            max_batches=max_batches
+        )
+        
+        return jsonify({
+            'success': True,
+            'message': f"Se archivaron {result['archived']} noticias",
+            **result
+        })
+        
+    except Exception as e:
+        logger.error(f"Error al archivar noticias: {str(e)}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@news_bp.route('/news/summaries/metrics', methods=['GET'])
+def get_summary_metrics():
+    """
+    Obtiene las métricas de la cola de resúmenes: profundidad, tiempos de
+    espera por clase de prioridad y consumo del presupuesto
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'metrics': get_summary_queue().metrics()
+        })
+        
+    except Exception as e:
+        logger.error(f"Error al obtener métricas de resúmenes: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@news_bp.route('/news/summaries/backfill', methods=['POST'])
+def backfill_summaries():
+    """
+    Genera los resúmenes pendientes mientras quede presupuesto
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        limit = min(data.get('limit', 50), 500)
+        
+        result = get_summary_queue().backfill(limit=limit)
+        db.session.commit()
+        
+        return jsonify({
+            'success': True,
+            'message': f"Se generaron {result['generated']} resúmenes pendientes",
+            **result
+        })
+        
+    except Exception as e:
+        logger.error(f"Error al generar resúmenes pendientes: {str(e)}")
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @news_bp.route('/sources', methods=['GET'])
 def get_sources():
     """
@@ -253,12 +543,21 @@ def add_source():
                 'error': 'Se requiere el nombre de la fuente'
             }), 400
         
+        weight = data.get('weight', 1.0)
+        if (isinstance(weight, bool) or not isinstance(weight, (int, float))
+                or not math.isfinite(weight) or weight <= 0):
+            return jsonify({
+                'success': False, 
+                'error': 'El peso de la fuente debe ser un número mayor que 0'
+            }), 400
+        
         source = NewsSource(
             name=data.get('name'),
             url=data.get('url', ''),
             source_type=data.get('source_type', 'api'),
             api_key=data.get('api_key', ''),
-            is_active=data.get('is_active', True)
+            is_active=data.get('is_active', True),
+            weight=float(weight)
         )
         
         db.session.add(source)
@@ -1,8 +1,12 @@
 from flask import Blueprint, jsonify, request
-from src.models.user import User, db
+from src.models.user import User, UserSubscription, db
+from src.models.news import NewsArticle, NewsSource
+from src.services.timeline_service import TimelineService
 
 user_bp = Blueprint('user', __name__)
 
+timeline_service = TimelineService()
+
 @user_bp.route('/users', methods=['GET'])
 def get_users():
     users = User.query.all()
@@ -34,6 +38,64 @@ def update_user(user_id):
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
 def delete_user(user_id):
     user = User.query.get_or_404(user_id)
+    timeline_service.delete_user_data(user.id)
     db.session.delete(user)
     db.session.commit()
     return '', 204
+
+@user_bp.route('/users/<int:user_id>/subscriptions', methods=['GET'])
+def get_subscriptions(user_id):
+    User.query.get_or_404(user_id)
+    subscriptions = UserSubscription.query.filter_by(user_id=user_id).all()
+    return jsonify([subscription.to_dict() for subscription in subscriptions])
+
+@user_bp.route('/users/<int:user_id>/subscriptions', methods=['POST'])
+def create_subscription(user_id):
+    User.query.get_or_404(user_id)
+    data = request.json or {}
+    source_id = data.get('source_id')
+    category = NewsArticle.normalize_category(data.get('category'))
+
+    # Una suscripción es a una fuente o a una categoría, no a ambas
+    if bool(source_id) == bool(category):
+        return jsonify({'error': 'Se requiere source_id o category'}), 400
+    if source_id:
+        NewsSource.query.get_or_404(source_id)
+
+    subscription = UserSubscription(user_id=user_id, source_id=source_id, category=category)
+    db.session.add(subscription)
+    db.session.flush()
+    timeline_service.add_subscription(subscription)
+    db.session.commit()
+    return jsonify(subscription.to_dict()), 201
+
+@user_bp.route('/users/<int:user_id>/subscriptions/<int:subscription_id>', methods=['DELETE'])
+def delete_subscription(user_id, subscription_id):
+    subscription = UserSubscription.query.filter_by(
+        id=subscription_id, user_id=user_id
+    ).first_or_404()
+    timeline_service.remove_subscription(subscription)
+    db.session.delete(subscription)
+    db.session.commit()
+    return '', 204
+
+@user_bp.route('/users/<int:user_id>/feed', methods=['GET'])
+def get_feed(user_id):
+    User.query.get_or_404(user_id)
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', 10, type=int), 1), 50)
+
+    articles, total = timeline_service.get_feed(user_id, page, per_page)
+    pages = (total + per_page - 1) // per_page
+    return jsonify({
+        'success': True,
+        'news': [article.to_dict() for article in articles],
+        'pagination': {
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'pages': pages,
+            'has_next': page < pages,
+            'has_prev': page > 1
+        }
+    })
@@ -0,0 +1,162 @@
+from src.models.news import db, NewsArticle, ArchivedArticle
+from datetime import datetime, timedelta
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class ArchiveService:
+    """
+    Servicio de retención de noticias.
+
+    Los artículos más antiguos que `retention_days` se mueven de la tabla
+    `news_articles` (datos recientes) a la base de datos de archivo en lotes
+    pequeños, confirmando cada lote por separado para no bloquear la ingesta.
+    Las búsquedas por id, URL y hash de contenido consultan el archivo cuando no encuentran
+    el artículo en la tabla principal.
+    """
+
+    DEFAULT_RETENTION_DAYS = 30
+    DEFAULT_BATCH_SIZE = 200
+
+    # Límite de parámetros por consulta IN para no superar el máximo de SQLite
+    LOOKUP_CHUNK_SIZE = 500
+
+    def archive_batch(self, retention_days: int = DEFAULT_RETENTION_DAYS,
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        Mueve al archivo un lote de los artículos más antiguos que el límite
+        de retención. Devuelve el número de artículos archivados.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        article_date = NewsArticle.retention_date()
+
+        articles = NewsArticle.query.filter(article_date < cutoff).order_by(
+            article_date
+        ).limit(batch_size).all()
+
+        if not articles:
+            return 0
+
+        try:
+            # Primero se escribe en el archivo: si el proceso se interrumpe antes
+            # de borrar, el siguiente lote omite los ids que ya se copiaron
+            ids = [article.id for article in articles]
+            already_archived = self.get_archived_articles(ids)
+            
+            # Un id ya archivado solo se borra si es el mismo artículo; si no,
+            # se ha reutilizado el id y borrar la fila perdería el artículo
+            for article in articles:
+                archived = already_archived.get(article.id)
+                if archived is not None and (
+                    archived.url != article.url or archived.created_at != article.created_at
+                ):
+                    raise RuntimeError(
+                        f"El artículo {article.id} del archivo no coincide con el de la "
+                        f"tabla principal ({archived.url!r} != {article.url!r})"
+                    )
+            
+            db.session.add_all(
+                ArchivedArticle.from_article(article)
+                for article in articles
+                if article.id not in already_archived
+            )
+            db.session.commit()
+
+            NewsArticle.query.filter(NewsArticle.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+
+        except Exception as e:
+            logger.error(f"Error al archivar artículos: {str(e)}")
+            db.session.rollback()
+            raise
+
+        return len(articles)
+
+    def run(self, retention_days: int = DEFAULT_RETENTION_DAYS,
+            batch_size: int = DEFAULT_BATCH_SIZE,
+            max_batches: Optional[int] = None,
+            pause: float = 0.05) -> Dict:
+        """
+        Archiva lotes hasta que no queden artículos antiguos o se alcance
+        `max_batches`, con una pausa entre lotes para dejar paso a la ingesta
+        """
+        archived = 0
+        batches = 0
+        start = time.perf_counter()
+
+        while max_batches is None or batches < max_batches:
+            count = self.archive_batch(retention_days, batch_size)
+            if not count:
+                break
+
+            archived += count
+            batches += 1
+
+            if count < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Archivados {archived} artículos en {batches} lotes ({elapsed:.2f} s)")
+
+        return {
+            'archived': archived,
+            'batches': batches,
+            'elapsed_seconds': round(elapsed, 3)
+        }
+
+    def get_article(self, article_id: int) -> Optional[Union[NewsArticle, ArchivedArticle]]:
+        """
+        Busca un artículo por id en la tabla principal y, si no está, en el archivo
+        """
+        article = db.session.get(NewsArticle, article_id)
+        if article is None:
+            article = db.session.get(ArchivedArticle, article_id)
+        return article
+
+    def get_archived_articles(self, article_ids: Iterable[int]) -> Dict[int, ArchivedArticle]:
+        """
+        Obtiene los artículos archivados con los ids dados
+        """
+        articles = {}
+        for chunk in self._chunks(list(article_ids)):
+            for article in ArchivedArticle.query.filter(ArchivedArticle.id.in_(chunk)):
+                articles[article.id] = article
+        return articles
+
+    def existing_urls(self, urls: Iterable[str]) -> Set[str]:
+        """
+        Devuelve las URLs que ya están guardadas, en la tabla principal o en el archivo
+        """
+        urls = [url for url in set(urls) if url is not None]
+        found = set()
+
+        for chunk in self._chunks(urls):
+            for model in (NewsArticle, ArchivedArticle):
+                rows = db.session.query(model.url).filter(model.url.in_(chunk))
+                found.update(url for (url,) in rows)
+
+        return found
+
+    def existing_content_hashes(self, hashes: Iterable[str]) -> Set[str]:
+        """
+        Devuelve los hashes de contenido que ya están guardados, en la tabla
+        principal o en el archivo
+        """
+        hashes = [content_hash for content_hash in set(hashes) if content_hash]
+        found = set()
+
+        for chunk in self._chunks(hashes):
+            for model in (NewsArticle, ArchivedArticle):
+                rows = db.session.query(model.content_hash).filter(model.content_hash.in_(chunk))
+                found.update(content_hash for (content_hash,) in rows)
+
+        return found
+
+    def _chunks(self, items: List) -> Iterable[List]:
+        for i in range(0, len(items), self.LOOKUP_CHUNK_SIZE):
+            yield items[i:i + self.LOOKUP_CHUNK_SIZE]
@@ -0,0 +1,171 @@
+import requests
+import codecs
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import hashlib
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from src.services.content_extractor import ContentExtractor
+from src.services.news_fetcher import USER_AGENT
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+class ContentEnricher:
+    """
+    Etapa opcional de enriquecimiento: descarga la página de cada artículo y
+    guarda el texto completo extraído en lugar del contenido truncado de la
+    fuente.
+
+    Las descargas se hacen en paralelo, con un límite de peticiones
+    simultáneas y un intervalo mínimo entre peticiones para cada host.
+    """
+
+    def __init__(self, max_workers: int = 8, per_host_limit: int = 2,
+                 per_host_interval: float = 0.5, timeout: float = 10,
+                 max_bytes: int = 2_000_000, extractor: Optional[ContentExtractor] = None):
+        self.per_host_limit = per_host_limit
+        self.per_host_interval = per_host_interval
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.extractor = extractor or ContentExtractor()
+
+        # Pool persistente: cada hilo conserva su sesión y sus conexiones abiertas
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='content-enricher')
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._host_next_request: Dict[str, float] = {}
+
+    def enrich(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Devuelve copias de los artículos con `content` reemplazado por el texto
+        extraído (si es más largo que el original) y su `content_hash`
+        """
+        if not articles:
+            return []
+
+        start = time.perf_counter()
+        enriched = list(self._pool.map(self._enrich_article, articles))
+
+        count = sum(1 for article in enriched if article.get('content_hash'))
+        logger.info(
+            f"Contenido completo extraído para {count} de {len(articles)} artículos "
+            f"en {time.perf_counter() - start:.2f} s"
+        )
+        return enriched
+
+    def fetch_content(self, url: str) -> Optional[str]:
+        """
+        Descarga una página y devuelve su texto principal
+        """
+        html = self._download(url)
+        if html is None:
+            return None
+        return self.extractor.extract(html)
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """
+        Hash del texto normalizado, para detectar el mismo artículo publicado
+        con distintas URLs
+        """
+        normalized = WHITESPACE_RE.sub(' ', text).strip().lower()
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+    def _enrich_article(self, article: Dict) -> Dict:
+        url = article.get('url') or ''
+        if not url.startswith('http'):
+            return article
+
+        try:
+            text = self.fetch_content(url)
+        except Exception as e:
+            logger.warning(f"No se pudo extraer el contenido de {url}: {str(e)}")
+            return article
+
+        if not text or len(text) <= len(article.get('content') or ''):
+            return article
+
+        enriched = article.copy()
+        enriched['content'] = text
+        enriched['content_hash'] = self.content_hash(text)
+        return enriched
+
+    def _download(self, url: str) -> Optional[str]:
+        host = urlparse(url).netloc.lower()
+
+        with self._host_slot(host):
+            response = self._session().get(url, timeout=self.timeout, stream=True)
+            try:
+                response.raise_for_status()
+
+                content_type = response.headers.get('Content-Type', '')
+                if content_type and 'html' not in content_type:
+                    return None
+
+                chunks = []
+                size = 0
+                for chunk in response.iter_content(chunk_size=65536):
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= self.max_bytes:
+                        break
+                body = b''.join(chunks)
+            finally:
+                response.close()
+
+        return body.decode(self._encoding(content_type, body), errors='replace')
+
+    @contextmanager
+    def _host_slot(self, host: str):
+        """
+        Limita las peticiones simultáneas a un host y espera el intervalo
+        mínimo desde la petición anterior al mismo host
+        """
+        with self._lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                scheduled = max(now, self._host_next_request.get(host, now))
+                self._host_next_request[host] = scheduled + self.per_host_interval
+
+            if scheduled > now:
+                time.sleep(scheduled - now)
+            yield
+
+    def _session(self) -> requests.Session:
+        # requests.Session no es seguro entre hilos: una sesión por hilo
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT})
+            self._local.session = session
+        return session
+
+    @staticmethod
+    def _encoding(content_type: str, body: bytes) -> str:
+        match = re.search(r'charset=([\w-]+)', content_type, re.IGNORECASE)
+        if match:
+            encoding = match.group(1)
+        else:
+            match = META_CHARSET_RE.search(body[:4096])
+            encoding = match.group(1).decode('ascii', errors='ignore') if match else 'utf-8'
+
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            return 'utf-8'
+        return encoding
@@ -0,0 +1,210 @@
+from html.parser import HTMLParser
+import re
+from typing import List, Optional
+
+# Elementos cuyo contenido nunca forma parte del artículo
+SKIP_TAGS = {
+    'head', 'title', 'script', 'style', 'noscript', 'template', 'svg', 'canvas', 'iframe',
+    'nav', 'header', 'footer', 'aside', 'form', 'button', 'select', 'textarea',
+    'figure', 'figcaption'
+}
+
+# Elementos que cierran un párrafo de texto
+PARAGRAPH_TAGS = {'p', 'pre', 'blockquote', 'li', 'h2', 'h3', 'h4', 'td', 'dd'}
+
+# Elementos que pueden contener el cuerpo del artículo
+CONTAINER_TAGS = {'div', 'article', 'section', 'main', 'body', 'td', 'ul', 'ol', 'blockquote'}
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr'
+}
+
+POSITIVE_RE = re.compile(
+    r'article|body|content|entry|main|news|noticia|page|post|story|text|cuerpo', re.IGNORECASE
+)
+NEGATIVE_RE = re.compile(
+    r'ad-|ads|banner|combx|comment|comentario|community|contact|footer|foot|masthead|'
+    r'menu|meta|modal|nav|newsletter|outbrain|popup|promo|related|relacionad|share|'
+    r'compartir|sidebar|social|sponsor|subscribe|suscri|tags|taboola|tool|widget',
+    re.IGNORECASE
+)
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+class _Node:
+    __slots__ = ('tag', 'index', 'weight', 'score')
+
+    def __init__(self, tag: str, index: int, weight: float):
+        self.tag = tag
+        self.index = index
+        self.weight = weight
+        self.score = 0.0
+
+class _DensityParser(HTMLParser):
+    """
+    Recorre el HTML una sola vez. Cada párrafo suma puntos a su contenedor y
+    la mitad a su abuelo, según su longitud, sus comas y su densidad de
+    enlaces; los párrafos se guardan con la lista de contenedores abiertos
+    para poder elegir después los del mejor candidato.
+    """
+
+    def __init__(self, min_paragraph_length: int):
+        super().__init__(convert_charrefs=True)
+        self.min_paragraph_length = min_paragraph_length
+        self.stack: List[_Node] = []
+        self.containers: List[_Node] = []
+        self.paragraphs = []
+        self.skip_tag = None
+        self.skip_depth = 0
+        self.link_depth = 0
+        self.text_parts: List[str] = []
+        self.link_chars = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == 'br':
+                self.text_parts.append(' ')
+            return
+
+        # Dentro de un elemento descartado solo se cuentan las aperturas de la
+        # misma etiqueta, así los elementos sin cerrar no alteran el recuento
+        if self.skip_depth:
+            if tag == self.skip_tag:
+                self.skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self.skip_tag = tag
+            self.skip_depth = 1
+            return
+
+        if tag == 'a':
+            self.link_depth += 1
+            return
+
+        if tag in PARAGRAPH_TAGS or tag in CONTAINER_TAGS:
+            self._flush_paragraph()
+
+        if tag in CONTAINER_TAGS:
+            attributes = dict(attrs)
+            class_and_id = f"{attributes.get('class') or ''} {attributes.get('id') or ''}"
+            weight = 0.0
+            if NEGATIVE_RE.search(class_and_id):
+                weight -= 25
+            if POSITIVE_RE.search(class_and_id):
+                weight += 25
+            if tag in ('article', 'main'):
+                weight += 10
+
+            node = _Node(tag, len(self.containers), weight)
+            self.containers.append(node)
+            self.stack.append(node)
+        elif tag in PARAGRAPH_TAGS:
+            self.stack.append(_Node(tag, -1, 0))
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+
+        if self.skip_depth:
+            if tag == self.skip_tag:
+                self.skip_depth -= 1
+            return
+
+        if tag == 'a':
+            self.link_depth = max(self.link_depth - 1, 0)
+            return
+
+        if tag in PARAGRAPH_TAGS or tag in CONTAINER_TAGS:
+            self._flush_paragraph()
+            # Cerrar hasta el elemento correspondiente (HTML mal anidado)
+            for i in range(len(self.stack) - 1, -1, -1):
+                if self.stack[i].tag == tag:
+                    del self.stack[i:]
+                    break
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+
+        self.text_parts.append(data)
+        if self.link_depth:
+            self.link_chars += len(data.strip())
+
+    def close(self):
+        super().close()
+        self._flush_paragraph()
+
+    def _flush_paragraph(self):
+        if not self.text_parts:
+            return
+
+        text = WHITESPACE_RE.sub(' ', ''.join(self.text_parts)).strip()
+        link_chars = self.link_chars
+        self.text_parts = []
+        self.link_chars = 0
+
+        if len(text) < self.min_paragraph_length:
+            return
+
+        link_density = min(link_chars / len(text), 1.0)
+        if link_density > 0.5:
+            return
+
+        containers = [node for node in self.stack if node.index >= 0]
+        if not containers:
+            return
+
+        score = (1 + text.count(',') + min(len(text) / 100, 3)) * (1 - link_density)
+        containers[-1].score += score
+        if len(containers) > 1:
+            containers[-2].score += score / 2
+
+        self.paragraphs.append((text, tuple(node.index for node in containers)))
+
+class ContentExtractor:
+    """
+    Extrae el texto principal de una página de noticias, descartando menús,
+    pies, comentarios y demás contenido repetido entre páginas.
+
+    Usa una puntuación por densidad de texto al estilo de Readability,
+    calculada en una sola pasada del parser HTML de la librería estándar.
+    """
+
+    def __init__(self, min_paragraph_length: int = 25, min_content_length: int = 200):
+        self.min_paragraph_length = min_paragraph_length
+        self.min_content_length = min_content_length
+
+    def extract(self, html: str) -> Optional[str]:
+        """
+        Devuelve el texto del artículo (párrafos separados por líneas en
+        blanco) o None si no se encuentra contenido suficiente
+        """
+        if not html:
+            return None
+
+        parser = _DensityParser(self.min_paragraph_length)
+        try:
+            parser.feed(html)
+            parser.close()
+        except Exception:
+            return None
+
+        best = None
+        for node in parser.containers:
+            if node.score <= 0:
+                continue
+            score = node.score * (1 + node.weight / 100)
+            if best is None or score > best[0]:
+                best = (score, node.index)
+
+        if best is None:
+            return None
+
+        best_index = best[1]
+        paragraphs = [text for text, containers in parser.paragraphs if best_index in containers]
+        content = '\n\n'.join(paragraphs)
+
+        if len(content) < self.min_content_length:
+            return None
+        return content
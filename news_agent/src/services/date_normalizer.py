@@ -0,0 +1,144 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import logging
+import re
+import time
+from typing import Callable, Dict, Optional, Union
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SPANISH_MONTHS = {
+    'enero': 1, 'ene': 1,
+    'febrero': 2, 'feb': 2,
+    'marzo': 3, 'mar': 3,
+    'abril': 4, 'abr': 4,
+    'mayo': 5, 'may': 5,
+    'junio': 6, 'jun': 6,
+    'julio': 7, 'jul': 7,
+    'agosto': 8, 'ago': 8,
+    'septiembre': 9, 'setiembre': 9, 'sep': 9, 'sept': 9, 'set': 9,
+    'octubre': 10, 'oct': 10,
+    'noviembre': 11, 'nov': 11,
+    'diciembre': 12, 'dic': 12,
+}
+
+# "martes, 10 de junio de 2025 14:00", "10 jun. 2025 - 14:00 h"
+# Anclada al final: no debe aceptar RFC 822 ("Tue, 10 Jun 2025 16:00:00 +0200")
+# descartando la zona horaria
+SPANISH_TEXT_RE = re.compile(
+    r'^(?:[a-záéíóúñ]+\.?,?\s+)?(\d{1,2})\s+(?:de\s+)?([a-záéíóúñ]+)\.?\s+(?:de\s+|del\s+)?(\d{4})'
+    r'(?:\s*(?:,|-|a\s+las)?\s*(\d{1,2}):(\d{2})(?::(\d{2}))?)?\s*(?:h\.?)?\s*$',
+    re.IGNORECASE
+)
+
+# "10/06/2025 14:00:00", "10-06-2025", "10.06.2025 14:00"
+SPANISH_NUMERIC_RE = re.compile(
+    r'^(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?$'
+)
+
+DateValue = Union[str, time.struct_time, datetime, None]
+
+class DateNormalizer:
+    """
+    Normaliza las fechas de las fuentes a datetime en UTC (sin tzinfo, igual que
+    `datetime.utcnow()`).
+
+    Reconoce ISO 8601 con o sin zona horaria, RFC 822 (RSS), formatos habituales
+    en español y las `struct_time` ya parseadas por feedparser. Las fechas sin
+    zona horaria se consideran UTC. Los formatos se prueban en el orden que
+    sugiere la forma de la cadena.
+    """
+
+    def __init__(self):
+        self._parsers: Dict[str, Callable[[str], Optional[datetime]]] = {
+            'iso': self._parse_iso,
+            'rfc822': self._parse_rfc822,
+            'es_numeric': self._parse_spanish_numeric,
+            'es_text': self._parse_spanish_text,
+        }
+
+    def normalize(self, value: DateValue) -> Optional[datetime]:
+        """
+        Convierte una fecha a datetime UTC sin tzinfo.
+        Devuelve None si no se reconoce el formato.
+        """
+        if value is None or value == '':
+            return None
+
+        if isinstance(value, datetime):
+            return self._to_utc(value)
+
+        if isinstance(value, time.struct_time):
+            # feedparser entrega las fechas *_parsed ya convertidas a UTC
+            return datetime(*value[:6])
+
+        date_str = str(value).strip()
+        if not date_str:
+            return None
+
+        for name in self._candidates(date_str):
+            result = self._parsers[name](date_str)
+            if result is not None:
+                return result
+
+        logger.debug(f"Formato de fecha no reconocido: {date_str!r}")
+        return None
+
+    def _candidates(self, date_str: str):
+        """
+        Ordena los formatos a probar según la forma de la cadena
+        """
+        first = date_str[0]
+        if first.isdigit():
+            if len(date_str) >= 10 and date_str[4] == '-':
+                return ('iso', 'es_numeric', 'rfc822', 'es_text')
+            if len(date_str) > 2 and (date_str[1] in '/.-' or date_str[2] in '/.-'):
+                return ('es_numeric', 'es_text', 'rfc822', 'iso')
+            return ('rfc822', 'es_text', 'es_numeric', 'iso')
+        return ('rfc822', 'es_text', 'iso', 'es_numeric')
+
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+    def _parse_iso(self, date_str: str) -> Optional[datetime]:
+        try:
+            return self._to_utc(datetime.fromisoformat(date_str))
+        except ValueError:
+            return None
+
+    def _parse_rfc822(self, date_str: str) -> Optional[datetime]:
+        try:
+            return self._to_utc(parsedate_to_datetime(date_str))
+        except (TypeError, ValueError, IndexError):
+            return None
+
+    def _parse_spanish_numeric(self, date_str: str) -> Optional[datetime]:
+        match = SPANISH_NUMERIC_RE.match(date_str)
+        if not match:
+            return None
+        day, month, year, hour, minute, second = match.groups()
+        return self._build(year, month, day, hour, minute, second)
+
+    def _parse_spanish_text(self, date_str: str) -> Optional[datetime]:
+        match = SPANISH_TEXT_RE.match(date_str)
+        if not match:
+            return None
+        day, month_name, year, hour, minute, second = match.groups()
+        month = SPANISH_MONTHS.get(month_name.lower())
+        if month is None:
+            return None
+        return self._build(year, month, day, hour, minute, second)
+
+    @staticmethod
+    def _build(year, month, day, hour, minute, second) -> Optional[datetime]:
+        try:
+            return datetime(
+                int(year), int(month), int(day),
+                int(hour or 0), int(minute or 0), int(second or 0)
+            )
+        except ValueError:
+            return None
@@ -0,0 +1,53 @@
+import threading
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+def lazy_service(factory: Callable[[], T]) -> Callable[[], T]:
+    """
+    Devuelve una función que crea el servicio la primera vez que se llama y
+    después reutiliza la misma instancia. Es segura entre hilos; si la
+    creación falla, se vuelve a intentar en la siguiente llamada.
+    """
+    instance = None
+    lock = threading.Lock()
+    
+    def get() -> T:
+        nonlocal instance
+        if instance is None:
+            with lock:
+                if instance is None:
+                    instance = factory()
+        return instance
+    
+    return get
+
+def _create_news_fetcher():
+    # Importación diferida: requests y BeautifulSoup solo se cargan al capturar noticias
+    from src.services.news_fetcher import NewsFetcher
+    return NewsFetcher()
+
+def _create_news_summarizer():
+    # Importación diferida: openai solo se carga (y exige credenciales) al resumir
+    from src.services.news_summarizer import NewsSummarizer
+    return NewsSummarizer()
+
+def _create_content_enricher():
+    from src.services.content_enricher import ContentEnricher
+    return ContentEnricher()
+
+def _create_summary_queue():
+    # El presupuesto se lee de la configuración de la aplicación activa
+    from flask import current_app
+    from src.services.summary_queue import SummaryBudget, SummaryQueue
+    config = current_app.config
+    budget = SummaryBudget(
+        tokens_per_minute=config.get('SUMMARY_TOKENS_PER_MINUTE', SummaryBudget.DEFAULT_TOKENS_PER_MINUTE),
+        daily_budget_usd=config.get('SUMMARY_DAILY_BUDGET_USD', SummaryBudget.DEFAULT_DAILY_BUDGET_USD)
+    )
+    return SummaryQueue(get_news_summarizer(), budget)
+
+get_news_fetcher = lazy_service(_create_news_fetcher)
+get_news_summarizer = lazy_service(_create_news_summarizer)
+get_content_enricher = lazy_service(_create_content_enricher)
+get_summary_queue = lazy_service(_create_summary_queue)
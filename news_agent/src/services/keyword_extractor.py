@@ -0,0 +1,48 @@
+import re
+from collections import Counter
+from typing import Dict, List
+
+TAG_RE = re.compile(r'<[^>]+>')
+TOKEN_RE = re.compile(r"[^\W\d_][\w'-]*", re.UNICODE)
+
+STOPWORDS = frozenset('''
+a al algo algunas algunos ante antes como con contra cual cuando de del desde donde durante
+e el ella ellas ellos en entre era es esa esas ese eso esos esta estas este esto estos fue
+fueron ha han hasta hay la las le les lo los mas más me mi mientras muy nada ni no nos o os
+otra otras otro otros para pero poco por porque que qué quien se sea ser si sí sin sobre son
+su sus también tan tiene tienen todo todos tras tu un una uno unos y ya año años dice dijo
+según ayer hoy mañana nuevo nueva nuevos nuevas puede pueden será están está sido
+the an and are as at be been but by for from has have he her his in is it its of on or
+that their they this to was were will with after over new says said about into more
+than up out who what when where which would could not
+'''.split())
+
+class KeywordExtractor:
+    """
+    Extrae las palabras clave de un artículo a partir del título y la
+    descripción: términos sin palabras vacías, con más peso en el título
+    """
+
+    def __init__(self, max_keywords: int = 5, min_length: int = 3, title_weight: int = 2):
+        self.max_keywords = max_keywords
+        self.min_length = min_length
+        self.title_weight = title_weight
+
+    def extract(self, article: Dict) -> List[str]:
+        scores = Counter()
+        first_seen = {}
+
+        fields = (
+            (article.get('title') or '', self.title_weight),
+            (article.get('description') or '', 1),
+        )
+        for text, weight in fields:
+            for token in TOKEN_RE.findall(TAG_RE.sub(' ', text).lower()):
+                token = token.strip("'-")
+                if len(token) < self.min_length or token in STOPWORDS:
+                    continue
+                scores[token] += weight
+                first_seen.setdefault(token, len(first_seen))
+
+        ranked = sorted(scores, key=lambda token: (-scores[token], first_seen[token]))
+        return ranked[:self.max_keywords]
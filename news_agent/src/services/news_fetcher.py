@@ -1,21 +1,26 @@
 import requests
+import feedparser
 from bs4 import BeautifulSoup
 from datetime import datetime
 import logging
 from typing import List, Dict, Optional
-import time
+from urllib.parse import urljoin, urlparse
+from src.services.date_normalizer import DateNormalizer, DateValue
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
 class NewsFetcher:
     """Servicio para capturar noticias de diferentes fuentes"""
     
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': USER_AGENT
         })
+        self.date_normalizer = DateNormalizer()
     
     def fetch_from_newsapi(self, api_key: str, country: str = 'us', category: str = None, page_size: int = 20) -> List[Dict]:
         """
@@ -48,7 +53,8 @@ class NewsFetcher:
                         'url_to_image': article.get('urlToImage', ''),
                         'source_name': article.get('source', {}).get('name', ''),
                         'author': article.get('author', ''),
-                        'published_at': self._parse_datetime(article.get('publishedAt'))
+                        'published_at': self._parse_datetime(article.get('publishedAt')),
+                        'category': category
                     }
                     articles.append(processed_article)
                 
@@ -67,8 +73,6 @@ class NewsFetcher:
         Captura noticias desde un feed RSS
         """
         try:
-            import feedparser
-            
             feed = feedparser.parse(rss_url)
             articles = []
             
@@ -81,7 +85,11 @@ class NewsFetcher:
                     'url_to_image': '',
                     'source_name': feed.feed.get('title', ''),
                     'author': entry.get('author', ''),
-                    'published_at': self._parse_datetime(entry.get('published'))
+                    'published_at': self._parse_datetime(
+                        entry.get('published_parsed') or entry.get('updated_parsed')
+                        or entry.get('published') or entry.get('updated')
+                    ),
+                    'category': entry.get('tags', [{}])[0].get('term') if entry.get('tags') else None
                 }
                 articles.append(article)
             
@@ -133,34 +141,9 @@ class NewsFetcher:
             logger.error(f"Error al scrapear {url}: {str(e)}")
             return []
     
-    def _parse_datetime(self, date_str: str) -> Optional[datetime]:
-        """Convierte string de fecha a datetime"""
-        if not date_str:
-            return None
-        
-        try:
-            # Formato ISO 8601 (NewsAPI)
-            if 'T' in date_str and 'Z' in date_str:
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            
-            # Otros formatos comunes
-            formats = [
-                '%Y-%m-%d %H:%M:%S',
-                '%Y-%m-%d',
-                '%d/%m/%Y %H:%M:%S',
-                '%d/%m/%Y'
-            ]
-            
-            for fmt in formats:
-                try:
-                    return datetime.strptime(date_str, fmt)
-                except ValueError:
-                    continue
-            
-            return datetime.utcnow()
-            
-        except Exception:
-            return datetime.utcnow()
+    def _parse_datetime(self, value: DateValue) -> Optional[datetime]:
+        """Convierte una fecha de la fuente a datetime UTC (None si no se reconoce)"""
+        return self.date_normalizer.normalize(value)
     
     def _get_absolute_url(self, base_url: str, relative_url: str) -> str:
         """Convierte URL relativa a absoluta"""
@@ -170,13 +153,11 @@ class NewsFetcher:
         if relative_url.startswith('http'):
             return relative_url
         
-        from urllib.parse import urljoin
         return urljoin(base_url, relative_url)
     
     def _get_domain_name(self, url: str) -> str:
         """Extrae el nombre del dominio de una URL"""
         try:
-            from urllib.parse import urlparse
             parsed = urlparse(url)
             return parsed.netloc.replace('www.', '')
         except:
@@ -1,8 +1,9 @@
 import openai
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional
 from datetime import datetime
 import re
+import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -10,14 +11,31 @@ logger = logging.getLogger(__name__)
 class NewsSummarizer:
     """Servicio para generar resúmenes de noticias usando IA"""
     
-    def __init__(self):
+    # Caracteres del contenido que se envían al modelo (el texto completo
+    # extraído por ContentEnricher puede ser mucho más largo)
+    MAX_CONTENT_CHARS = 3000
+    
+    def __init__(self, client: Optional[openai.OpenAI] = None):
         # La clave de API ya está configurada en las variables de entorno
-        self.client = openai.OpenAI()
+        self.client = client or openai.OpenAI()
+    
+    # Tokens máximos de cada resumen y estimación de caracteres por token,
+    # para calcular el coste de una petición antes de hacerla
+    SUMMARY_MAX_TOKENS = 150
+    CHARS_PER_TOKEN = 4
+    PROMPT_OVERHEAD_TOKENS = 120
     
-    def summarize_article(self, article: Dict) -> Optional[str]:
+    def summarize_article(self, article: Dict, usage: Optional[Dict] = None) -> Optional[str]:
         """
         Genera un resumen de un artículo individual
+        
+        Si se pasa un diccionario en `usage`, se completa con los tokens
+        consumidos (`prompt_tokens`, `completion_tokens`) o con `error` si la
+        petición al modelo falla.
         """
+        if usage is None:
+            usage = {}
+        
         try:
             # Preparar el texto del artículo
             text_to_summarize = self._prepare_article_text(article)
@@ -48,10 +66,14 @@ class NewsSummarizer:
                     {"role": "system", "content": "Eres un periodista experto que crea resúmenes concisos y objetivos de noticias en español."},
                     {"role": "user", "content": prompt}
                 ],
-                max_tokens=150,
+                max_tokens=self.SUMMARY_MAX_TOKENS,
                 temperature=0.3
             )
             
+            if getattr(response, 'usage', None):
+                usage['prompt_tokens'] = response.usage.prompt_tokens
+                usage['completion_tokens'] = response.usage.completion_tokens
+            
             summary = response.choices[0].message.content.strip()
             
             # Limpiar el resumen
@@ -62,8 +84,21 @@ class NewsSummarizer:
             
         except Exception as e:
             logger.error(f"Error al generar resumen: {str(e)}")
+            usage['error'] = str(e)
             return None
     
+    def estimate_tokens(self, article: Dict) -> Dict[str, int]:
+        """
+        Estima los tokens de entrada y salida que consumirá resumir un artículo
+        """
+        text = self._prepare_article_text(article)
+        if not text or len(text.strip()) < 50:
+            return {'prompt_tokens': 0, 'completion_tokens': 0}
+        
+        title = article.get('title') or ''
+        prompt_tokens = (len(text) + len(title)) // self.CHARS_PER_TOKEN + self.PROMPT_OVERHEAD_TOKENS
+        return {'prompt_tokens': prompt_tokens, 'completion_tokens': self.SUMMARY_MAX_TOKENS}
+    
     def summarize_multiple_articles(self, articles: List[Dict]) -> List[Dict]:
         """
         Genera resúmenes para múltiples artículos
@@ -82,7 +117,6 @@ class NewsSummarizer:
                 summarized_articles.append(article_with_summary)
                 
                 # Pequeña pausa para evitar límites de rate
-                import time
                 time.sleep(0.5)
                 
             except Exception as e:
@@ -101,26 +135,105 @@ class NewsSummarizer:
             if not articles:
                 return "No hay noticias disponibles en este momento."
             
-            # Seleccionar los artículos más recientes
-            sorted_articles = sorted(
-                articles, 
-                key=lambda x: x.get('published_at', datetime.min), 
-                reverse=True
-            )[:max_articles]
-            
-            # Preparar el contenido para el digest
-            articles_text = ""
-            for i, article in enumerate(sorted_articles, 1):
-                title = article.get('title', 'Sin título')
-                summary = article.get('summary', article.get('description', ''))
-                source = article.get('source_name', 'Fuente desconocida')
+            response = self.client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=self._build_digest_messages(articles, max_articles),
+                max_tokens=400,
+                temperature=0.4
+            )
+            
+            digest = response.choices[0].message.content.strip()
+            
+            logger.info("Digest de noticias generado exitosamente")
+            return digest
+            
+        except Exception as e:
+            logger.error(f"Error al generar digest: {str(e)}")
+            return "Error al generar el digest de noticias."
+    
+    def stream_news_digest(self, articles: List[Dict], max_articles: int = 5,
+                           metrics: Optional[Dict] = None) -> Iterator[str]:
+        """
+        Genera el digest en modo streaming, devolviendo los fragmentos de texto
+        a medida que llegan del modelo.
+        
+        Si se pasa un diccionario en `metrics`, se completa con el tiempo hasta
+        el primer token (`time_to_first_token_ms`), el tiempo total
+        (`total_time_ms`) y el número de fragmentos recibidos (`chunks`).
+        """
+        if metrics is None:
+            metrics = {}
+        
+        if not articles:
+            metrics.update({'time_to_first_token_ms': 0.0, 'total_time_ms': 0.0, 'chunks': 0})
+            yield "No hay noticias disponibles en este momento."
+            return
+        
+        start = time.perf_counter()
+        chunks = 0
+        
+        try:
+            stream = self.client.chat.completions.create(
+                model="gpt-4.1-mini",
+                messages=self._build_digest_messages(articles, max_articles),
+                max_tokens=400,
+                temperature=0.4,
+                stream=True
+            )
+            
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                
+                text = chunk.choices[0].delta.content
+                if not text:
+                    continue
                 
-                articles_text += f"{i}. {title}\n"
-                articles_text += f"   Fuente: {source}\n"
-                articles_text += f"   {summary}\n\n"
+                if chunks == 0:
+                    metrics['time_to_first_token_ms'] = (time.perf_counter() - start) * 1000
+                chunks += 1
+                yield text
             
-            # Crear el prompt para el digest
-            prompt = f"""
+            metrics['chunks'] = chunks
+            metrics['total_time_ms'] = (time.perf_counter() - start) * 1000
+            logger.info(
+                f"Digest en streaming generado: primer token en "
+                f"{metrics.get('time_to_first_token_ms', 0):.0f} ms, "
+                f"total {metrics['total_time_ms']:.0f} ms"
+            )
+            
+        except Exception as e:
+            logger.error(f"Error al generar digest en streaming: {str(e)}")
+            metrics['chunks'] = chunks
+            metrics['total_time_ms'] = (time.perf_counter() - start) * 1000
+            metrics['error'] = str(e)
+            if chunks == 0:
+                yield "Error al generar el digest de noticias."
+    
+    def _build_digest_messages(self, articles: List[Dict], max_articles: int) -> List[Dict]:
+        """
+        Construye los mensajes del chat para generar el digest
+        """
+        # Seleccionar los artículos más recientes
+        sorted_articles = sorted(
+            articles, 
+            key=lambda x: x.get('published_at') or '', 
+            reverse=True
+        )[:max_articles]
+        
+        # Preparar el contenido para el digest
+        articles_text = ""
+        for i, article in enumerate(sorted_articles, 1):
+            title = article.get('title', 'Sin título')
+            summary = article.get('summary') or article.get('description', '')
+            source = article.get('source_name', 'Fuente desconocida')
+            
+            articles_text += f"{i}. {title}\n"
+            articles_text += f"   Fuente: {source}\n"
+            articles_text += f"   {summary}\n\n"
+        
+        # Crear el prompt para el digest
+        prompt = f"""
             Crea un digest de noticias en español basado en los siguientes artículos. 
             El digest debe:
             - Ser un resumen ejecutivo de las noticias más importantes
@@ -134,25 +247,11 @@ class NewsSummarizer:
             
             Digest de Noticias:
             """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": "Eres un editor de noticias experto que crea digests informativos y bien estructurados en español."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=400,
-                temperature=0.4
-            )
-            
-            digest = response.choices[0].message.content.strip()
-            
-            logger.info("Digest de noticias generado exitosamente")
-            return digest
-            
-        except Exception as e:
-            logger.error(f"Error al generar digest: {str(e)}")
-            return "Error al generar el digest de noticias."
+        
+        return [
+            {"role": "system", "content": "Eres un editor de noticias experto que crea digests informativos y bien estructurados en español."},
+            {"role": "user", "content": prompt}
+        ]
     
     def _prepare_article_text(self, article: Dict) -> str:
         """
@@ -171,9 +270,9 @@ class NewsSummarizer:
         # Agregar contenido (limitado)
         if article.get('content'):
             content = article['content']
-            # Limitar el contenido a 1000 caracteres para evitar tokens excesivos
-            if len(content) > 1000:
-                content = content[:1000] + "..."
+            # Limitar el contenido para evitar tokens excesivos
+            if len(content) > self.MAX_CONTENT_CHARS:
+                content = content[:self.MAX_CONTENT_CHARS] + "..."
             text_parts.append(content)
         
         return " ".join(text_parts)
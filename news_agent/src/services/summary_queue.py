@@ -0,0 +1,438 @@
+from src.models.news import db, NewsArticle, NewsSource, SummarySpend
+from collections import Counter, deque
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TAG_RE = re.compile(r'<[^>]+>')
+WHITESPACE_RE = re.compile(r'\s+')
+
+class SummaryBudget:
+    """
+    Presupuesto de la IA: tokens por minuto (ventana deslizante de 60 s) y
+    coste diario en dólares (se reinicia a medianoche UTC).
+
+    Cada petición reserva los tokens estimados antes de hacerse y después se
+    ajusta con el consumo real que devuelve el modelo. El coste diario se
+    guarda en `summary_spend`, así que lo comparten todos los procesos (p. ej.
+    los workers de gunicorn) y sobrevive a los reinicios; la reserva es un
+    UPDATE condicional en una transacción propia. Los tokens por minuto se
+    cuentan en memoria, por proceso: con N workers el límite efectivo es N
+    veces el configurado.
+    """
+
+    WINDOW = 60.0
+
+    # Límites por defecto y precios de gpt-4.1-mini (USD por millón de tokens)
+    DEFAULT_TOKENS_PER_MINUTE = 100_000
+    DEFAULT_DAILY_BUDGET_USD = 2.0
+    DEFAULT_INPUT_PRICE_PER_MILLION = 0.40
+    DEFAULT_OUTPUT_PRICE_PER_MILLION = 1.60
+
+    def __init__(self, tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+                 daily_budget_usd: float = DEFAULT_DAILY_BUDGET_USD,
+                 input_price_per_million: float = DEFAULT_INPUT_PRICE_PER_MILLION,
+                 output_price_per_million: float = DEFAULT_OUTPUT_PRICE_PER_MILLION):
+        self.tokens_per_minute = tokens_per_minute
+        self.daily_budget_usd = daily_budget_usd
+        self.input_price_per_million = input_price_per_million
+        self.output_price_per_million = output_price_per_million
+
+        self._lock = threading.Lock()
+        self._window = deque()  # (instante, tokens)
+        self._window_tokens = 0
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * self.input_price_per_million
+                + completion_tokens * self.output_price_per_million) / 1_000_000
+
+    def reserve(self, estimate: Dict[str, int]) -> bool:
+        """
+        Reserva el consumo estimado si cabe en los dos límites
+        """
+        tokens = estimate['prompt_tokens'] + estimate['completion_tokens']
+        cost = self.cost(estimate['prompt_tokens'], estimate['completion_tokens'])
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+
+            if self._window_tokens + tokens > self.tokens_per_minute:
+                return False
+            if not self._reserve_daily(tokens, cost):
+                return False
+
+            self._window.append((now, tokens))
+            self._window_tokens += tokens
+            return True
+
+    def settle(self, estimate: Dict[str, int], usage: Dict) -> None:
+        """
+        Sustituye la reserva por el consumo real. Si la petición falló sin
+        devolver consumo, se mantiene la estimación.
+        """
+        if 'prompt_tokens' not in usage:
+            return
+
+        tokens = (usage['prompt_tokens'] + usage['completion_tokens']
+                  - estimate['prompt_tokens'] - estimate['completion_tokens'])
+        cost = (self.cost(usage['prompt_tokens'], usage['completion_tokens'])
+                - self.cost(estimate['prompt_tokens'], estimate['completion_tokens']))
+
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._window.append((now, tokens))
+            self._window_tokens += tokens
+
+        table = SummarySpend.__table__
+        with db.engine.begin() as connection:
+            connection.execute(table.update().where(
+                table.c.day == datetime.utcnow().date()
+            ).values(
+                tokens=table.c.tokens + tokens,
+                cost_usd=table.c.cost_usd + cost
+            ))
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            self._expire(time.monotonic())
+            window_tokens = self._window_tokens
+
+        table = SummarySpend.__table__
+        with db.engine.connect() as connection:
+            spend = connection.execute(
+                table.select().where(table.c.day == datetime.utcnow().date())
+            ).first()
+        daily_cost = spend.cost_usd if spend else 0.0
+
+        return {
+            'tokens_per_minute_limit': self.tokens_per_minute,
+            'tokens_last_minute': window_tokens,
+            'daily_budget_usd': self.daily_budget_usd,
+            'daily_cost_usd': round(daily_cost, 6),
+            'daily_tokens': spend.tokens if spend else 0,
+            'daily_requests': spend.requests if spend else 0,
+            'daily_budget_used': round(daily_cost / self.daily_budget_usd, 4) if self.daily_budget_usd else None
+        }
+
+    def _reserve_daily(self, tokens: int, cost: float) -> bool:
+        """
+        Suma la reserva al consumo del día solo si no supera el presupuesto.
+        Se confirma enseguida para que los demás procesos la vean.
+        """
+        table = SummarySpend.__table__
+        today = datetime.utcnow().date()
+
+        with db.engine.begin() as connection:
+            connection.execute(
+                self._insert(connection, table).values(
+                    day=today, tokens=0, cost_usd=0.0, requests=0
+                ).on_conflict_do_nothing()
+            )
+            reserved = connection.execute(table.update().where(
+                table.c.day == today,
+                table.c.cost_usd + cost <= self.daily_budget_usd
+            ).values(
+                tokens=table.c.tokens + tokens,
+                cost_usd=table.c.cost_usd + cost,
+                requests=table.c.requests + 1
+            )).rowcount
+
+        return reserved == 1
+
+    def _expire(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= self.WINDOW:
+            self._window_tokens -= self._window.popleft()[1]
+
+    @staticmethod
+    def _insert(connection, table):
+        if connection.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(table)
+
+class SummaryQueue:
+    """
+    Cola de prioridad delante de NewsSummarizer.
+
+    Los artículos se resumen por orden de prioridad (recencia, peso de la
+    fuente y tamaño del grupo de artículos sobre el mismo tema) mientras el
+    presupuesto lo permita. Los que no caben se guardan con la descripción
+    como resumen (`summary_status = 'fallback'`) y `backfill` los resume
+    más tarde, cuando vuelve a haber capacidad. Los que fallan MAX_ATTEMPTS
+    veces se marcan como `'failed'` y no se reintentan.
+    """
+
+    PRIORITY_CLASSES = ('high', 'normal', 'low')
+    HIGH_PRIORITY = 1.0
+    NORMAL_PRIORITY = 0.25
+
+    RECENCY_HALF_LIFE_HOURS = 6
+    # Peticiones fallidas tras las que un artículo se queda con el resumen de respaldo
+    MAX_ATTEMPTS = 3
+    FALLBACK_MAX_CHARS = 300
+    WAIT_SAMPLES = 500
+
+    def __init__(self, summarizer, budget: SummaryBudget):
+        self.summarizer = summarizer
+        self.budget = budget
+
+        self._lock = threading.Lock()
+        self._depth = 0
+        self._waits = {name: deque(maxlen=self.WAIT_SAMPLES) for name in self.PRIORITY_CLASSES}
+        self._counts = Counter()
+
+    def process(self, articles: List[Dict]) -> List[Dict]:
+        """
+        Devuelve copias de los artículos con `summary`, `summary_generated_at`
+        y `summary_status`, en el mismo orden en que se recibieron
+        """
+        if not articles:
+            return []
+
+        results = [article.copy() for article in articles]
+        enqueued_at = time.monotonic()
+        for article in results:
+            article.setdefault('_enqueued_at', enqueued_at)
+        self._run(results)
+
+        for article in results:
+            article.pop('_enqueued_at', None)
+        return results
+
+    def backfill(self, limit: int = 20, retry_failed: bool = True) -> Dict:
+        """
+        Resume los artículos guardados con el resumen de respaldo, por orden de
+        prioridad y mientras haya presupuesto. Con `retry_failed=False` solo se
+        toman los que se aplazaron por presupuesto, sin peticiones fallidas.
+        No hace commit.
+        """
+        query = NewsArticle.query.filter(NewsArticle.summary_status == 'fallback')
+        if not retry_failed:
+            query = query.filter(db.func.coalesce(NewsArticle.summary_attempts, 0) == 0)
+        candidates = query.order_by(NewsArticle.published_at.desc()).limit(limit * 5).all()
+
+        if not candidates:
+            return {'generated': 0, 'failed': 0, 'pending': 0}
+
+        by_id = {article.id: article for article in candidates}
+        now = time.monotonic()
+        items = []
+        for article in candidates:
+            created_at = article.created_at or datetime.utcnow()
+            waited = max((datetime.utcnow() - created_at).total_seconds(), 0)
+            items.append({
+                'id': article.id,
+                'title': article.title,
+                'description': article.description,
+                'content': article.content,
+                'source_name': article.source_name,
+                'published_at': article.published_at,
+                'keywords': article.keywords.split(',') if article.keywords else [],
+                'summary_attempts': article.summary_attempts or 0,
+                '_enqueued_at': now - waited
+            })
+
+        generated = 0
+        failed = 0
+        for item in self._run(items, limit=limit, defer=False):
+            article = by_id[item['id']]
+            article.summary_attempts = item.get('summary_attempts', article.summary_attempts)
+            article.summary_status = item['summary_status']
+            if item['summary_status'] == 'generated':
+                article.summary = item['summary']
+                article.summary_generated_at = item['summary_generated_at']
+                generated += 1
+            elif item['summary_status'] == 'failed':
+                failed += 1
+
+        if generated or failed:
+            logger.info(f"Resúmenes pendientes generados: {generated}, descartados tras {self.MAX_ATTEMPTS} fallos: {failed}")
+        return {'generated': generated, 'failed': failed, 'pending': self.pending_count()}
+
+    def pending_count(self) -> int:
+        return NewsArticle.query.filter(NewsArticle.summary_status == 'fallback').count()
+
+    def priority(self, article: Dict, cluster_size: int, source_weight: float) -> float:
+        """
+        Prioridad de un artículo: decae a la mitad cada RECENCY_HALF_LIFE_HOURS
+        horas desde su publicación y crece con el peso de la fuente y con el
+        número de artículos del lote que comparten sus palabras clave
+        """
+        published_at = article.get('published_at')
+        if isinstance(published_at, datetime):
+            age_hours = max((datetime.utcnow() - published_at).total_seconds() / 3600, 0)
+        else:
+            age_hours = 0
+        recency = 0.5 ** (age_hours / self.RECENCY_HALF_LIFE_HOURS)
+        return recency * source_weight * (1 + 0.5 * (cluster_size - 1))
+
+    def priority_class(self, priority: float) -> str:
+        if priority >= self.HIGH_PRIORITY:
+            return 'high'
+        if priority >= self.NORMAL_PRIORITY:
+            return 'normal'
+        return 'low'
+
+    def metrics(self) -> Dict:
+        with self._lock:
+            wait_time = {}
+            for name, samples in self._waits.items():
+                ordered = sorted(samples)
+                wait_time[name] = {
+                    'samples': len(ordered),
+                    'p50_seconds': round(ordered[len(ordered) // 2], 3) if ordered else None,
+                    'p95_seconds': round(ordered[int(len(ordered) * 0.95)], 3) if ordered else None,
+                    'max_seconds': round(ordered[-1], 3) if ordered else None
+                }
+            counts = dict(self._counts)
+            depth = self._depth
+
+        return {
+            'queue_depth': depth,
+            'pending_backfill': self.pending_count(),
+            'wait_time': wait_time,
+            'processed': counts,
+            'budget': self.budget.metrics()
+        }
+
+    def _run(self, items: List[Dict], limit: Optional[int] = None,
+             defer: bool = True) -> List[Dict]:
+        """
+        Resume los artículos por orden de prioridad y devuelve los procesados.
+        Con `limit` solo se procesan los `limit` primeros. Con `defer=False`
+        (relleno de pendientes) se para al agotar el presupuesto en lugar de
+        asignar el resumen de respaldo al resto.
+        """
+        weights = self._source_weights()
+        cluster_sizes = self._cluster_sizes(items)
+        counter = itertools.count()
+
+        heap = []
+        for item, cluster_size in zip(items, cluster_sizes):
+            weight = weights.get(item.get('source_name'), 1.0)
+            priority = self.priority(item, cluster_size, weight)
+            heapq.heappush(heap, (-priority, next(counter), item))
+
+        with self._lock:
+            self._depth += len(heap)
+
+        processed = []
+        try:
+            while heap:
+                negative_priority, _, item = heapq.heappop(heap)
+                with self._lock:
+                    self._depth -= 1
+
+                if limit is not None and len(processed) >= limit:
+                    continue
+
+                priority_class = self.priority_class(-negative_priority)
+                if self._summarize(item, priority_class, defer):
+                    processed.append(item)
+                elif not defer:
+                    break
+        finally:
+            with self._lock:
+                self._depth -= len(heap)
+
+        return processed
+
+    def _summarize(self, item: Dict, priority_class: str, defer: bool = True) -> bool:
+        """
+        Resume un artículo si hay presupuesto. Si no lo hay, le asigna el
+        resumen de respaldo (con `defer`) o lo deja sin tocar y devuelve False.
+        """
+        estimate = self.summarizer.estimate_tokens(item)
+        if not estimate['prompt_tokens']:
+            item['summary'] = None
+            item['summary_status'] = 'skipped'
+            self._record(item, priority_class, 'skipped')
+            return True
+
+        if not self.budget.reserve(estimate):
+            if not defer:
+                return False
+            # Sin presupuesto: descripción como resumen provisional, se resume más tarde
+            item['summary'] = self.fallback_summary(item)
+            item['summary_generated_at'] = None
+            item['summary_status'] = 'fallback'
+            self._record(item, priority_class, 'deferred')
+            return True
+
+        # La espera termina al salir de la cola; el resultado se conoce tras la petición
+        waited = self._waited(item)
+        usage = {}
+        summary = self.summarizer.summarize_article(item, usage=usage)
+        self.budget.settle(estimate, usage)
+        item['summary_attempts'] = item.get('summary_attempts', 0) + 1
+
+        if summary:
+            item['summary'] = summary
+            item['summary_generated_at'] = datetime.utcnow()
+            item['summary_status'] = 'generated'
+            self._record(item, priority_class, 'generated', waited)
+        else:
+            item['summary'] = self.fallback_summary(item)
+            item['summary_generated_at'] = None
+            # Tras MAX_ATTEMPTS fallos se deja de reintentar
+            item['summary_status'] = 'failed' if item['summary_attempts'] >= self.MAX_ATTEMPTS else 'fallback'
+            self._record(item, priority_class, 'failed', waited)
+        return True
+
+    @staticmethod
+    def _waited(item: Dict) -> float:
+        return time.monotonic() - item.get('_enqueued_at', time.monotonic())
+
+    def _record(self, item: Dict, priority_class: str, outcome: str,
+                waited: Optional[float] = None) -> None:
+        if waited is None:
+            waited = self._waited(item)
+        with self._lock:
+            self._waits[priority_class].append(waited)
+            self._counts[f'{priority_class}_{outcome}'] += 1
+
+    @classmethod
+    def fallback_summary(cls, item: Dict) -> Optional[str]:
+        """
+        Resumen provisional: la descripción (o el contenido) sin etiquetas
+        HTML, truncada a FALLBACK_MAX_CHARS caracteres
+        """
+        text = item.get('description') or item.get('content') or ''
+        text = WHITESPACE_RE.sub(' ', TAG_RE.sub(' ', text)).strip()
+        if not text:
+            return None
+        if len(text) > cls.FALLBACK_MAX_CHARS:
+            text = text[:cls.FALLBACK_MAX_CHARS].rsplit(' ', 1)[0] + '...'
+        return text
+
+    def _cluster_sizes(self, items: List[Dict]) -> List[int]:
+        """
+        Tamaño del grupo de cada artículo: cuántos artículos del lote comparten
+        su palabra clave más repetida
+        """
+        keyword_counts = Counter()
+        for item in items:
+            keyword_counts.update(set(item.get('keywords') or []))
+
+        return [
+            max((keyword_counts[keyword] for keyword in item.get('keywords') or []), default=1)
+            for item in items
+        ]
+
+    def _source_weights(self) -> Dict[str, float]:
+        rows = db.session.query(NewsSource.name, NewsSource.weight).filter(
+            NewsSource.is_active == True,
+            NewsSource.weight.isnot(None)
+        )
+        return {name: weight for name, weight in rows}
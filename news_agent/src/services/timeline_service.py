@@ -0,0 +1,252 @@
+from collections import defaultdict
+from src.models.user import db, UserSubscription, UserTimeline
+from src.models.news import NewsArticle, NewsSource, ArchivedArticle
+from src.services.archive_service import ArchiveService
+from sqlalchemy import cast, or_
+from datetime import datetime
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TimelineService:
+    """
+    Servicio para mantener los timelines precalculados de cada usuario.
+    
+    Cada vez que se guardan artículos nuevos se reparten (fan-out-on-write) a
+    los timelines de los usuarios suscritos a su fuente o categoría, de modo
+    que leer el feed de un usuario solo cuesta una página de ids.
+    
+    Los timelines están en orden de captura: id descendente. Cada captura se
+    guarda de la noticia más antigua a la más reciente, así que dentro de una
+    captura el orden también es el de publicación.
+    """
+    
+    # Límite de parámetros por consulta IN para no superar el máximo de SQLite
+    BATCH_SIZE = 500
+    
+    def fan_out(self, articles: List[NewsArticle]) -> int:
+        """
+        Agrega los artículos recién guardados a los timelines de sus suscriptores.
+        
+        Los artículos deben tener id asignado. Devuelve el número de timelines
+        actualizados. No hace commit.
+        """
+        if not articles:
+            return 0
+        
+        # Fuentes configuradas que corresponden a los artículos
+        source_ids_by_name = defaultdict(list)
+        source_names = {article.source_name for article in articles if article.source_name}
+        if source_names:
+            rows = db.session.query(NewsSource.id, NewsSource.name).filter(
+                NewsSource.name.in_(source_names)
+            )
+            for source_id, name in rows:
+                source_ids_by_name[name].append(source_id)
+        
+        source_ids = [sid for ids in source_ids_by_name.values() for sid in ids]
+        categories = {article.category for article in articles if article.category}
+        
+        if not source_ids and not categories:
+            return 0
+        
+        # Suscriptores por fuente y por categoría
+        users_by_source = defaultdict(set)
+        users_by_category = defaultdict(set)
+        filters = []
+        if source_ids:
+            filters.append(UserSubscription.source_id.in_(source_ids))
+        if categories:
+            filters.append(UserSubscription.category.in_(categories))
+        
+        rows = db.session.query(
+            UserSubscription.user_id,
+            UserSubscription.source_id,
+            UserSubscription.category
+        ).filter(or_(*filters))
+        
+        for user_id, source_id, sub_category in rows:
+            if source_id is not None:
+                users_by_source[source_id].add(user_id)
+            if sub_category:
+                users_by_category[sub_category].add(user_id)
+        
+        # Ids nuevos por usuario, del más reciente al más antiguo
+        new_ids_by_user = defaultdict(list)
+        for article in sorted(articles, key=lambda a: a.id, reverse=True):
+            users = set()
+            for source_id in source_ids_by_name.get(article.source_name, ()):
+                users |= users_by_source[source_id]
+            if article.category:
+                users |= users_by_category[article.category]
+            
+            for user_id in users:
+                new_ids_by_user[user_id].append(article.id)
+        
+        self._prepend(new_ids_by_user)
+        
+        logger.info(f"Fan-out de {len(articles)} artículos a {len(new_ids_by_user)} timelines")
+        return len(new_ids_by_user)
+    
+    def add_subscription(self, subscription: UserSubscription) -> int:
+        """
+        Incorpora al timeline los artículos ya guardados de una nueva
+        suscripción. No hace commit. Devuelve el tamaño del timeline.
+        """
+        timeline = self._get_or_create(subscription.user_id)
+        ids = UserTimeline.unpack(timeline.article_ids)
+        
+        condition = self._subscription_filter(subscription)
+        if condition is not None:
+            rows = db.session.query(NewsArticle.id).filter(condition).order_by(
+                NewsArticle.id.desc()
+            ).limit(UserTimeline.MAX_LENGTH)
+            ids = sorted(set(ids).union(article_id for (article_id,) in rows), reverse=True)
+        
+        timeline.article_ids = UserTimeline.pack(ids)
+        return min(len(ids), UserTimeline.MAX_LENGTH)
+    
+    def remove_subscription(self, subscription: UserSubscription) -> int:
+        """
+        Quita del timeline los artículos de una suscripción eliminada, salvo
+        los que sigan cubiertos por otra suscripción del usuario. No hace
+        commit. Devuelve el tamaño del timeline.
+        """
+        timeline = db.session.get(UserTimeline, subscription.user_id)
+        if timeline is None:
+            return 0
+        
+        ids = UserTimeline.unpack(timeline.article_ids)
+        if not ids or self._subscription_filter(subscription) is None:
+            return len(ids)
+        
+        others = UserSubscription.query.filter(
+            UserSubscription.user_id == subscription.user_id,
+            UserSubscription.id != subscription.id
+        ).all()
+        
+        # Los artículos pueden estar en la tabla principal o ya en el archivo
+        removed = set()
+        for model in (NewsArticle, ArchivedArticle):
+            removed |= self._matching_ids(model, ids, [subscription])
+        if removed and others:
+            for model in (NewsArticle, ArchivedArticle):
+                removed -= self._matching_ids(model, list(removed), others)
+        
+        ids = [article_id for article_id in ids if article_id not in removed]
+        timeline.article_ids = UserTimeline.pack(ids)
+        return len(ids)
+    
+    def get_feed(self, user_id: int, page: int = 1, per_page: int = 10) -> Tuple[List, int]:
+        """
+        Obtiene una página del feed de un usuario y el total de elementos del timeline
+        """
+        timeline = db.session.get(UserTimeline, user_id)
+        if timeline is None:
+            return [], 0
+        
+        ids = timeline.page((page - 1) * per_page, per_page)
+        if not ids:
+            return [], len(timeline)
+        
+        articles = {
+            article.id: article
+            for article in NewsArticle.query.filter(NewsArticle.id.in_(ids))
+        }
+        
+        # Los artículos que ya no están en la tabla principal se buscan en el archivo
+        missing = [article_id for article_id in ids if article_id not in articles]
+        if missing:
+            articles.update(ArchiveService().get_archived_articles(missing))
+        
+        return [articles[i] for i in ids if i in articles], len(timeline)
+    
+    def delete_user_data(self, user_id: int):
+        """
+        Elimina las suscripciones y el timeline de un usuario. No hace commit.
+        """
+        UserSubscription.query.filter_by(user_id=user_id).delete()
+        UserTimeline.query.filter_by(user_id=user_id).delete()
+    
+    def _subscription_filter(self, subscription: UserSubscription, model=NewsArticle):
+        """
+        Condición sobre `model` (NewsArticle o ArchivedArticle) para los
+        artículos de una suscripción
+        """
+        if subscription.category:
+            return model.category == subscription.category
+        
+        source = db.session.get(NewsSource, subscription.source_id) if subscription.source_id else None
+        if source is not None:
+            return model.source_name == source.name
+        return None
+    
+    def _matching_ids(self, model, article_ids: List[int], subscriptions: List[UserSubscription]) -> set:
+        """
+        Ids de `article_ids` que pertenecen a alguna de las suscripciones
+        """
+        conditions = [self._subscription_filter(other, model) for other in subscriptions]
+        conditions = [condition for condition in conditions if condition is not None]
+        if not conditions:
+            return set()
+        
+        found = set()
+        for chunk in self._chunks(article_ids, self.BATCH_SIZE):
+            rows = db.session.query(model.id).filter(model.id.in_(chunk), or_(*conditions))
+            found.update(article_id for (article_id,) in rows)
+        return found
+    
+    def _get_or_create(self, user_id: int) -> UserTimeline:
+        timeline = db.session.get(UserTimeline, user_id)
+        if timeline is None:
+            timeline = UserTimeline(user_id=user_id, article_ids=b'')
+            db.session.add(timeline)
+        return timeline
+    
+    def _prepend(self, new_ids_by_user: Dict[int, List[int]]):
+        """
+        Antepone los ids nuevos a cada timeline, recortando al tamaño máximo
+        sin decodificar la lista existente.
+        
+        La concatenación se hace en la propia sentencia (INSERT ... ON CONFLICT
+        DO UPDATE), así dos procesos que reparten a la vez no leen el mismo
+        valor antiguo ni se pisan los ids del otro.
+        """
+        dialect = db.session.get_bind(mapper=UserTimeline).dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        
+        max_bytes = UserTimeline.MAX_LENGTH * UserTimeline.ITEM_SIZE
+        table = UserTimeline.__table__
+        statement = insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=['user_id'],
+            set_={
+                'article_ids': db.func.substr(
+                    cast(statement.excluded.article_ids.concat(table.c.article_ids), db.LargeBinary),
+                    1, max_bytes
+                ),
+                'updated_at': statement.excluded.updated_at
+            }
+        )
+        
+        now = datetime.utcnow()
+        for chunk in self._chunks(list(new_ids_by_user), self.BATCH_SIZE):
+            # Sentencias de Core: evitan el coste por fila de la unidad de trabajo del ORM
+            db.session.execute(statement, [
+                {
+                    'user_id': user_id,
+                    'article_ids': UserTimeline.pack(new_ids_by_user[user_id]),
+                    'updated_at': now
+                }
+                for user_id in chunk
+            ])
+    
+    @staticmethod
+    def _chunks(items: List, size: int) -> Iterable[List]:
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
@@ -0,0 +1,232 @@
+from src.models.news import db, NewsArticle, TrendCounter, TrendTotal, TrendWindow
+from collections import Counter
+from datetime import datetime, timedelta
+import logging
+import threading
+import time
+from typing import Dict, List, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class TrendService:
+    """
+    Servicio de tendencias: mantiene contadores por hora de artículos por
+    fuente, categoría y término, y sus totales en ventanas móviles de
+    1, 6, 24, 72 y 168 horas, actualizados al guardar artículos.
+
+    Cuando una hora sale de una ventana, sus contadores se restan de los
+    totales, así que avanzar las ventanas cuesta lo mismo que las claves de
+    esa hora. El top-k lee los `limit` primeros totales por índice: su coste
+    no depende del número de artículos de la ventana. Los resultados se
+    guardan unos segundos en memoria.
+    """
+
+    DIMENSIONS = ('source', 'category', 'term')
+    WINDOWS = (1, 6, 24, 72, 168)
+    BUCKET = timedelta(hours=1)
+    CACHE_TTL = 30
+
+    def __init__(self):
+        self._cache: Dict[Tuple, Tuple[float, List[Dict]]] = {}
+        self._cache_lock = threading.Lock()
+
+    def record(self, articles: List[NewsArticle]) -> int:
+        """
+        Suma los artículos guardados a los contadores de su hora de
+        publicación y a los totales de las ventanas que la incluyen, y elimina
+        los contadores anteriores a la ventana más larga. No hace commit.
+        Devuelve el número de contadores actualizados.
+        """
+        now = datetime.utcnow()
+        oldest_by_window = self._advance_windows(now)
+        oldest = min(oldest_by_window.values())
+        increments = Counter()
+
+        for article in articles:
+            published_at = article.published_at or now
+            bucket = self._bucket_start(min(published_at, now))
+            if bucket < oldest:
+                continue
+
+            if article.source_name:
+                increments[('source', article.source_name[:200], bucket)] += 1
+            if article.category:
+                increments[('category', article.category, bucket)] += 1
+            for term in (article.keywords or '').split(','):
+                if term:
+                    increments[('term', term[:200], bucket)] += 1
+
+        if increments:
+            self._upsert_counters(increments)
+
+            totals = Counter()
+            for (dimension, key, bucket), count in increments.items():
+                for hours, window_oldest in oldest_by_window.items():
+                    if bucket >= window_oldest:
+                        totals[(dimension, hours, key)] += count
+            self._upsert_totals(totals)
+
+        # Las horas anteriores a la ventana más larga ya se han restado de los totales
+        TrendCounter.query.filter(TrendCounter.bucket_start < oldest).delete(synchronize_session=False)
+
+        with self._cache_lock:
+            self._cache.clear()
+
+        return len(increments)
+
+    def top(self, dimension: str, hours: int = 24, limit: int = 10) -> List[Dict]:
+        """
+        Devuelve las `limit` claves con más artículos en la ventana de
+        `window_for(hours)` horas. Si alguna ventana tiene que avanzar, se
+        actualizan sus totales y se hace commit.
+        """
+        if dimension not in self.DIMENSIONS:
+            raise ValueError(f"Dimensión no válida: {dimension}")
+
+        window = self.window_for(hours)
+        cache_key = (dimension, window, limit)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self.CACHE_TTL:
+            return cached[1]
+
+        if self._windows_behind(datetime.utcnow()):
+            try:
+                self._advance_windows(datetime.utcnow())
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+        rows = db.session.query(TrendTotal.key, TrendTotal.count).filter(
+            TrendTotal.dimension == dimension,
+            TrendTotal.window_hours == window
+        ).order_by(TrendTotal.count.desc(), TrendTotal.key).limit(limit)
+
+        result = [{'key': key, 'count': count} for key, count in rows]
+
+        with self._cache_lock:
+            self._cache[cache_key] = (time.monotonic(), result)
+        return result
+
+    def window_for(self, hours: int) -> int:
+        """
+        Ventana precalculada más pequeña que cubre `hours` horas
+        """
+        for window in self.WINDOWS:
+            if hours <= window:
+                return window
+        return self.WINDOWS[-1]
+
+    def _windows_behind(self, now: datetime) -> bool:
+        current = self._bucket_start(now)
+        states = dict(db.session.query(TrendWindow.window_hours, TrendWindow.oldest_bucket))
+        return any(
+            states.get(hours) != current - (hours - 1) * self.BUCKET
+            for hours in self.WINDOWS
+        )
+
+    def _advance_windows(self, now: datetime) -> Dict[int, datetime]:
+        """
+        Mueve cada ventana hasta la hora actual: resta de los totales las horas
+        que han salido de ella (o calcula los totales desde los contadores la
+        primera vez). No hace commit. Devuelve la primera hora de cada ventana.
+        """
+        current = self._bucket_start(now)
+        states = dict(db.session.query(TrendWindow.window_hours, TrendWindow.oldest_bucket))
+        table = TrendWindow.__table__
+        expired = False
+
+        for hours in self.WINDOWS:
+            oldest = current - (hours - 1) * self.BUCKET
+            previous = states.get(hours)
+
+            if previous is None:
+                claimed = db.session.execute(
+                    self._insert(table).values(window_hours=hours, oldest_bucket=oldest).on_conflict_do_nothing()
+                ).rowcount
+                if claimed:
+                    self._upsert_totals(self._counts_between(oldest, None, hours))
+
+            elif previous < oldest:
+                # Solo el proceso que consigue mover la ventana resta sus horas
+                claimed = db.session.execute(
+                    table.update().where(
+                        table.c.window_hours == hours,
+                        table.c.oldest_bucket == previous
+                    ).values(oldest_bucket=oldest)
+                ).rowcount
+                if claimed:
+                    self._subtract_totals(self._counts_between(previous, oldest, hours))
+                    expired = True
+
+        if expired:
+            TrendTotal.query.filter(TrendTotal.count <= 0).delete(synchronize_session=False)
+            with self._cache_lock:
+                self._cache.clear()
+
+        return {hours: current - (hours - 1) * self.BUCKET for hours in self.WINDOWS}
+
+    def _counts_between(self, start: datetime, end, hours: int) -> Counter:
+        total = db.func.sum(TrendCounter.count)
+        query = db.session.query(TrendCounter.dimension, TrendCounter.key, total).filter(
+            TrendCounter.bucket_start >= start
+        )
+        if end is not None:
+            query = query.filter(TrendCounter.bucket_start < end)
+
+        return Counter({
+            (dimension, hours, key): int(count)
+            for dimension, key, count in query.group_by(TrendCounter.dimension, TrendCounter.key)
+        })
+
+    def _upsert_counters(self, increments: Counter):
+        statement = self._insert(TrendCounter.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=['dimension', 'key', 'bucket_start'],
+            set_={'count': TrendCounter.__table__.c.count + statement.excluded.count}
+        )
+        db.session.execute(statement, [
+            {'dimension': dimension, 'key': key, 'bucket_start': bucket, 'count': count}
+            for (dimension, key, bucket), count in increments.items()
+        ])
+
+    def _upsert_totals(self, totals: Counter):
+        if not totals:
+            return
+        statement = self._insert(TrendTotal.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=['dimension', 'window_hours', 'key'],
+            set_={'count': TrendTotal.__table__.c.count + statement.excluded.count}
+        )
+        db.session.execute(statement, [
+            {'dimension': dimension, 'window_hours': hours, 'key': key, 'count': count}
+            for (dimension, hours, key), count in totals.items()
+        ])
+
+    def _subtract_totals(self, totals: Counter):
+        if not totals:
+            return
+        table = TrendTotal.__table__
+        statement = table.update().where(
+            table.c.dimension == db.bindparam('b_dimension'),
+            table.c.window_hours == db.bindparam('b_window_hours'),
+            table.c.key == db.bindparam('b_key')
+        ).values(count=table.c.count - db.bindparam('b_count'))
+        db.session.execute(statement, [
+            {'b_dimension': dimension, 'b_window_hours': hours, 'b_key': key, 'b_count': count}
+            for (dimension, hours, key), count in totals.items()
+        ])
+
+    @staticmethod
+    def _insert(table):
+        dialect = db.session.get_bind(mapper=TrendCounter).dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        return insert(table)
+
+    def _bucket_start(self, value: datetime) -> datetime:
+        return value.replace(minute=0, second=0, microsecond=0)
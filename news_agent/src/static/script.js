@@ -314,8 +314,52 @@ async function updateStats() {
     }
 }
 
-// Generar digest
-async function generateDigest() {
+// Generar digest (en streaming, fragmento a fragmento)
+function generateDigest() {
+    if (!window.EventSource) {
+        generateDigestBlocking();
+        return;
+    }
+    
+    let digestText = '';
+    const source = new EventSource(`${API_BASE}/news/digest/stream`);
+    
+    elements.digestContent.innerHTML = '';
+    elements.digestDate.textContent = '';
+    elements.digestSection.classList.remove('hidden');
+    elements.digestSection.scrollIntoView({ behavior: 'smooth' });
+    
+    source.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        digestText += data.text;
+        elements.digestContent.innerHTML = digestText.replace(/\n/g, '<br>');
+    };
+    
+    source.addEventListener('done', (event) => {
+        const result = JSON.parse(event.data);
+        source.close();
+        
+        elements.digestContent.innerHTML = result.digest.content.replace(/\n/g, '<br>');
+        elements.digestDate.textContent = new Date(result.digest.generated_at).toLocaleString('es-ES');
+        
+        showNotification('Digest generado exitosamente', 'success');
+    });
+    
+    source.addEventListener('error', (event) => {
+        source.close();
+        
+        if (event.data) {
+            const result = JSON.parse(event.data);
+            showNotification(`Error al generar digest: ${result.error}`, 'error');
+        } else {
+            console.error('Error al generar digest:', event);
+            showNotification('Error al generar digest', 'error');
+        }
+    });
+}
+
+// Generar digest esperando la respuesta completa
+async function generateDigestBlocking() {
     try {
         showLoading(true);
         
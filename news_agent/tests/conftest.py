@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+# Los módulos se importan como `src.*`, igual que en src/main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    Aplicación con las rutas de la API y bases de datos SQLite temporales
+    (principal y archivo), dentro de un contexto de aplicación
+    """
+    from flask import Flask
+    from src.models.user import db
+    from src.models.migrations import migrate_database
+    from src.routes.news import news_bp
+    from src.routes.user import user_bp
+
+    app = Flask(__name__)
+    app.config.update(
+        TESTING=True,
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'app.db'}",
+        SQLALCHEMY_BINDS={'archive': f"sqlite:///{tmp_path / 'archive.db'}"},
+        SQLALCHEMY_TRACK_MODIFICATIONS=False,
+    )
+    db.init_app(app)
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(news_bp, url_prefix='/api')
+
+    with app.app_context():
+        migrate_database()
+        yield app
+        db.session.remove()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.user import db
+from src.models.news import NewsArticle, ArchivedArticle
+from src.models.migrations import migrate_database
+from src.services.archive_service import ArchiveService
+
+def _article(title, days_ago, **fields):
+    return NewsArticle(
+        title=title,
+        description=f'Descripción de {title}',
+        url=f'https://example.com/{title}',
+        published_at=datetime.utcnow() - timedelta(days=days_ago),
+        **fields
+    )
+
+@pytest.fixture
+def service(app):
+    return ArchiveService()
+
+def test_archive_batch_copies_and_deletes_old_articles(service):
+    old = _article('vieja', 40, keywords='economía,bolsa')
+    recent = _article('reciente', 1)
+    db.session.add_all([old, recent])
+    db.session.commit()
+    old_id = old.id
+
+    assert service.archive_batch(retention_days=30) == 1
+
+    assert db.session.get(NewsArticle, old_id) is None
+    assert NewsArticle.query.count() == 1
+    archived = db.session.get(ArchivedArticle, old_id).to_dict()
+    assert archived['title'] == 'vieja'
+    assert archived['description'] == 'Descripción de vieja'
+    assert archived['keywords'] == ['economía', 'bolsa']
+    assert service.get_article(old_id).url == 'https://example.com/vieja'
+
+def test_archive_uses_created_at_without_published_at(service):
+    db.session.add(NewsArticle(title='sin fecha', created_at=datetime.utcnow() - timedelta(days=40)))
+    db.session.commit()
+
+    assert service.run(retention_days=30, pause=0)['archived'] == 1
+
+def test_run_archives_in_batches(service):
+    db.session.add_all(_article(f'vieja-{i}', 40 + i) for i in range(5))
+    db.session.commit()
+
+    result = service.run(retention_days=30, batch_size=2, pause=0)
+    assert result['archived'] == 5
+    assert result['batches'] == 3
+    assert ArchivedArticle.query.count() == 5
+
+def test_archived_ids_are_not_reused(service):
+    first, last = _article('primera', 40), _article('última', 40)
+    db.session.add_all([first, last])
+    db.session.commit()
+    last_id = last.id
+
+    service.archive_batch(retention_days=30)
+    # Con las dos filas borradas, SQLite sin AUTOINCREMENT volvería a asignar el id
+    reused = _article('nueva', 40)
+    db.session.add(reused)
+    db.session.commit()
+    assert reused.id > last_id
+
+    assert service.archive_batch(retention_days=30) == 1
+    assert ArchivedArticle.query.count() == 3
+    assert db.session.get(ArchivedArticle, last_id).title == 'última'
+
+def test_migration_reserves_ids_already_in_archive(service):
+    db.session.add(ArchivedArticle(id=500, title='archivada', url='https://example.com/archivada'))
+    db.session.commit()
+
+    migrate_database()
+    article = _article('nueva', 1)
+    db.session.add(article)
+    db.session.commit()
+    assert article.id > 500
+
+def test_archive_batch_refuses_mismatched_archive_row(service):
+    article = _article('vieja', 40)
+    db.session.add(article)
+    db.session.commit()
+    db.session.add(ArchivedArticle(id=article.id, title='otra', url='https://example.com/otra'))
+    db.session.commit()
+
+    with pytest.raises(RuntimeError):
+        service.archive_batch(retention_days=30)
+    assert db.session.get(NewsArticle, article.id) is not None
+
+def test_archive_batch_skips_rows_copied_before_an_interruption(service):
+    article = _article('vieja', 40)
+    db.session.add(article)
+    db.session.commit()
+    db.session.add(ArchivedArticle.from_article(article))
+    db.session.commit()
+
+    assert service.archive_batch(retention_days=30) == 1
+    assert NewsArticle.query.count() == 0
+    assert ArchivedArticle.query.count() == 1
+
+@pytest.mark.parametrize('body', [
+    {'retention_days': 'x'},
+    {'retention_days': -1},
+    {'retention_days': 0},
+    {'retention_days': 1.5},
+    {'batch_size': 0},
+    {'batch_size': True},
+    {'max_batches': None},
+    {'max_batches': -3},
+])
+def test_archive_endpoint_rejects_invalid_parameters(client, body):
+    db.session.add(_article('vieja', 40))
+    db.session.commit()
+
+    response = client.post('/api/news/archive', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+    assert NewsArticle.query.count() == 1
+
+def test_archive_endpoint_archives_old_articles(client):
+    db.session.add_all([_article('vieja', 40), _article('reciente', 1)])
+    db.session.commit()
+
+    response = client.post('/api/news/archive', json={'retention_days': 30, 'batch_size': 5000})
+    assert response.status_code == 200
+    assert response.get_json()['archived'] == 1
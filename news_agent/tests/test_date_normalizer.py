@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+import time
+
+import pytest
+
+from src.services.date_normalizer import DateNormalizer
+
+@pytest.fixture
+def normalizer():
+    return DateNormalizer()
+
+@pytest.mark.parametrize('value, expected', [
+    ('2025-06-10T14:00:00Z', datetime(2025, 6, 10, 14, 0)),
+    ('2025-06-10T16:00:00+02:00', datetime(2025, 6, 10, 14, 0)),
+    ('2025-06-10 14:00:00', datetime(2025, 6, 10, 14, 0)),
+    ('Tue, 10 Jun 2025 16:00:00 +0200', datetime(2025, 6, 10, 14, 0)),
+    ('Tue, 10 Jun 2025 14:00:00 GMT', datetime(2025, 6, 10, 14, 0)),
+    ('10/06/2025 14:00:00', datetime(2025, 6, 10, 14, 0)),
+    ('10.06.2025', datetime(2025, 6, 10)),
+    ('martes, 10 de junio de 2025 14:00', datetime(2025, 6, 10, 14, 0)),
+    ('10 jun. 2025 - 14:00 h', datetime(2025, 6, 10, 14, 0)),
+    ('10 de septiembre del 2025 a las 9:30', datetime(2025, 9, 10, 9, 30)),
+])
+def test_formats_are_normalized_to_naive_utc(normalizer, value, expected):
+    assert normalizer.normalize(value) == expected
+
+@pytest.mark.parametrize('value', [None, '', '   ', 'ayer', '31/02/2025', '10 de juniembre de 2025'])
+def test_unrecognized_values_return_none(normalizer, value):
+    assert normalizer.normalize(value) is None
+
+def test_datetime_and_struct_time(normalizer):
+    aware = datetime(2025, 6, 10, 16, 0, tzinfo=timezone(timedelta(hours=2)))
+    assert normalizer.normalize(aware) == datetime(2025, 6, 10, 14, 0)
+    assert normalizer.normalize(datetime(2025, 6, 10, 14, 0)) == datetime(2025, 6, 10, 14, 0)
+
+    parsed = time.struct_time((2025, 6, 10, 14, 0, 0, 1, 161, 0))
+    assert normalizer.normalize(parsed) == datetime(2025, 6, 10, 14, 0)
+
+def test_spanish_text_does_not_swallow_rfc822_offset(normalizer):
+    assert normalizer._parse_spanish_text('Tue, 10 Jun 2025 16:00:00 +0200') is None
+
+def test_mixed_formats_from_one_feed(normalizer):
+    assert normalizer.normalize('10 de junio de 2025 14:00') == datetime(2025, 6, 10, 14, 0)
+    assert normalizer.normalize('Tue, 10 Jun 2025 16:00:00 +0200') == datetime(2025, 6, 10, 14, 0)
+    assert normalizer.normalize('10/06/2025 14:00') == datetime(2025, 6, 10, 14, 0)
+    assert normalizer.normalize('2025-06-10T16:00:00+02:00') == datetime(2025, 6, 10, 14, 0)
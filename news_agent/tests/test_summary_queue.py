@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.user import db
+from src.models.news import NewsArticle
+from src.services.summary_queue import SummaryBudget, SummaryQueue
+
+# 1000 tokens de entrada y 250 de salida cuestan 0.0008 USD con los precios por defecto
+ESTIMATE = {'prompt_tokens': 1000, 'completion_tokens': 250}
+
+class FakeSummarizer:
+    def __init__(self, summary='Resumen generado'):
+        self.summary = summary
+        self.calls = []
+
+    def estimate_tokens(self, article):
+        return dict(ESTIMATE)
+
+    def summarize_article(self, article, usage=None):
+        self.calls.append(article['title'])
+        if self.summary is None:
+            usage['error'] = 'timeout'
+            return None
+        usage.update(prompt_tokens=500, completion_tokens=100)
+        return self.summary
+
+def _item(title, hours_ago):
+    return {
+        'title': title,
+        'description': f'Descripción de <b>{title}</b>',
+        'source_name': 'Eco Diario',
+        'published_at': datetime.utcnow() - timedelta(hours=hours_ago),
+        'keywords': [],
+    }
+
+def test_daily_budget_is_shared_between_processes(app):
+    first = SummaryBudget(daily_budget_usd=0.002)
+    second = SummaryBudget(daily_budget_usd=0.002)
+
+    assert first.reserve(ESTIMATE)
+    assert second.reserve(ESTIMATE)
+    assert not first.reserve(ESTIMATE)
+    assert not second.reserve(ESTIMATE)
+
+    # Un proceso nuevo (o reiniciado) ve el gasto del día
+    metrics = SummaryBudget(daily_budget_usd=0.002).metrics()
+    assert metrics['daily_requests'] == 2
+    assert metrics['daily_cost_usd'] == pytest.approx(0.0016)
+    assert metrics['tokens_last_minute'] == 0
+
+def test_settle_replaces_estimate_with_usage(app):
+    budget = SummaryBudget()
+    assert budget.reserve(ESTIMATE)
+
+    budget.settle(ESTIMATE, {'prompt_tokens': 500, 'completion_tokens': 100})
+    metrics = budget.metrics()
+    assert metrics['daily_tokens'] == 600
+    assert metrics['daily_cost_usd'] == pytest.approx(budget.cost(500, 100))
+    assert metrics['tokens_last_minute'] == 600
+
+    # Sin consumo en la respuesta se mantiene la estimación
+    assert budget.reserve(ESTIMATE)
+    budget.settle(ESTIMATE, {'error': 'timeout'})
+    assert budget.metrics()['daily_tokens'] == 1850
+
+def test_tokens_per_minute_are_counted_per_process(app):
+    budget = SummaryBudget(tokens_per_minute=2000)
+    assert budget.reserve(ESTIMATE)
+    assert not budget.reserve(ESTIMATE)
+    assert SummaryBudget(tokens_per_minute=2000).reserve(ESTIMATE)
+
+def test_daily_budget_resets_at_midnight_utc(app, monkeypatch):
+    now = [datetime(2025, 6, 10, 23, 59)]
+
+    class FakeDateTime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return now[0]
+
+    monkeypatch.setattr('src.services.summary_queue.datetime', FakeDateTime)
+    budget = SummaryBudget(daily_budget_usd=0.001)
+    assert budget.reserve(ESTIMATE)
+    assert not budget.reserve(ESTIMATE)
+
+    now[0] = datetime(2025, 6, 11, 0, 1)
+    assert SummaryBudget(daily_budget_usd=0.001).reserve(ESTIMATE)
+
+def test_process_summarizes_by_priority_and_defers_the_rest(app):
+    summarizer = FakeSummarizer()
+    queue = SummaryQueue(summarizer, SummaryBudget(daily_budget_usd=0.001))
+
+    results = queue.process([_item('antigua', 20), _item('reciente', 1)])
+
+    assert summarizer.calls == ['reciente']
+    assert [article['title'] for article in results] == ['antigua', 'reciente']
+    assert results[1]['summary_status'] == 'generated'
+    assert results[0]['summary_status'] == 'fallback'
+    assert results[0]['summary'] == 'Descripción de antigua'
+
+def test_backfill_marks_failed_after_max_attempts(app):
+    article = NewsArticle(title='pendiente', description='Descripción de pendiente',
+                          summary_status='fallback', summary_attempts=SummaryQueue.MAX_ATTEMPTS - 1)
+    db.session.add(article)
+    db.session.commit()
+    queue = SummaryQueue(FakeSummarizer(summary=None), SummaryBudget())
+
+    # El relleno tras capturar no reintenta las peticiones fallidas
+    assert queue.backfill(retry_failed=False) == {'generated': 0, 'failed': 0, 'pending': 0}
+
+    result = queue.backfill()
+    db.session.commit()
+    assert result['failed'] == 1
+    assert article.summary_status == 'failed'
+    assert article.summary_attempts == SummaryQueue.MAX_ATTEMPTS
+    assert queue.pending_count() == 0
+
+def test_fallback_summary_strips_tags_and_truncates():
+    assert SummaryQueue.fallback_summary({'description': '<p>Hola   <b>mundo</b></p>'}) == 'Hola mundo'
+    summary = SummaryQueue.fallback_summary({'description': 'palabra ' * 100})
+    assert len(summary) <= SummaryQueue.FALLBACK_MAX_CHARS + 3
+    assert summary.endswith('...')
+    assert SummaryQueue.fallback_summary({}) is None
+
+def test_fetch_without_summarizer_saves_fallback_summaries(client, monkeypatch):
+    class FakeFetcher:
+        def fetch_from_rss(self, rss_url):
+            return [dict(_item('sin resumen', 1), url='https://example.com/sin-resumen')]
+
+    def no_summaries():
+        raise RuntimeError('sin credenciales')
+
+    monkeypatch.setattr('src.routes.news.get_news_fetcher', lambda: FakeFetcher())
+    monkeypatch.setattr('src.routes.news.get_summary_queue', no_summaries)
+
+    response = client.post('/api/news/fetch', json={'source_type': 'rss', 'rss_url': 'a'})
+    assert response.get_json()['articles_saved'] == 1
+
+    article = NewsArticle.query.one()
+    assert article.summary_status == 'fallback'
+    assert article.summary == 'Descripción de sin resumen'
+    assert SummaryQueue(FakeSummarizer(), SummaryBudget()).pending_count() == 1
@@ -0,0 +1,124 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.user import db, User, UserSubscription, UserTimeline
+from src.models.news import NewsArticle
+from src.services.timeline_service import TimelineService
+
+class FakeFetcher:
+    def __init__(self, feeds):
+        self.feeds = feeds
+
+    def fetch_from_rss(self, rss_url):
+        return [dict(article) for article in self.feeds[rss_url]]
+
+def _no_summaries():
+    raise RuntimeError('sin credenciales')
+
+def _rss_item(title, hours_ago):
+    return {
+        'title': title,
+        'description': f'Descripción de {title}',
+        'url': f'https://example.com/{title.replace(" ", "-")}',
+        'source_name': 'Eco Diario',
+        'category': 'eco',
+        'published_at': datetime.utcnow() - timedelta(hours=hours_ago),
+    }
+
+@pytest.fixture
+def user(app):
+    user = User(username='lector', email='lector@example.com')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def feeds(monkeypatch):
+    # Las fuentes listan primero lo más reciente
+    feeds = {
+        'a': [_rss_item('A 1', 1), _rss_item('A 2', 2)],
+        'b': [_rss_item('B 30', 30), _rss_item('B 40', 40)],
+    }
+    monkeypatch.setattr('src.routes.news.get_news_fetcher', lambda: FakeFetcher(feeds))
+    monkeypatch.setattr('src.routes.news.get_summary_queue', _no_summaries)
+    return feeds
+
+def _feed_titles(client, user_id):
+    response = client.get(f'/api/users/{user_id}/feed?per_page=50')
+    assert response.status_code == 200
+    return [article['title'] for article in response.get_json()['news']]
+
+def test_pack_unpack_and_page():
+    ids = list(range(10, 0, -1))
+    timeline = UserTimeline(user_id=1, article_ids=UserTimeline.pack(ids))
+
+    assert UserTimeline.unpack(timeline.article_ids) == ids
+    assert len(timeline) == 10
+    assert timeline.page(0, 3) == [10, 9, 8]
+    assert timeline.page(8, 5) == [2, 1]
+    assert timeline.page(20, 5) == []
+
+def test_pack_truncates_to_max_length(monkeypatch):
+    monkeypatch.setattr(UserTimeline, 'MAX_LENGTH', 3)
+    assert UserTimeline.unpack(UserTimeline.pack([5, 4, 3, 2, 1])) == [5, 4, 3]
+
+def test_fan_out_prepends_and_truncates(app, user, monkeypatch):
+    monkeypatch.setattr(UserTimeline, 'MAX_LENGTH', 5)
+    db.session.add(UserSubscription(user_id=user.id, category='eco'))
+    db.session.commit()
+    service = TimelineService()
+
+    for batch in range(3):
+        articles = [NewsArticle(title=f'{batch}-{i}', category='eco') for i in range(2)]
+        db.session.add_all(articles)
+        db.session.commit()
+        service.fan_out(articles)
+        db.session.commit()
+
+    timeline = db.session.get(UserTimeline, user.id)
+    ids = UserTimeline.unpack(timeline.article_ids)
+    assert ids == sorted(ids, reverse=True)
+    assert ids == [6, 5, 4, 3, 2]
+
+def test_feed_is_in_ingest_order_and_matches_subscription_backfill(client, user, feeds):
+    response = client.post(f'/api/users/{user.id}/subscriptions', json={'category': 'eco'})
+    assert response.status_code == 201
+    subscription_id = response.get_json()['id']
+
+    for rss_url in ('a', 'b'):
+        response = client.post('/api/news/fetch', json={'source_type': 'rss', 'rss_url': rss_url})
+        assert response.get_json()['articles_saved'] == 2
+
+    # Última captura primero y, dentro de cada captura, por fecha de publicación
+    fanned_out = _feed_titles(client, user.id)
+    assert fanned_out == ['B 30', 'B 40', 'A 1', 'A 2']
+
+    # Volver a suscribirse reconstruye el timeline con el mismo orden
+    client.delete(f'/api/users/{user.id}/subscriptions/{subscription_id}')
+    assert _feed_titles(client, user.id) == []
+    client.post(f'/api/users/{user.id}/subscriptions', json={'category': 'eco'})
+    assert _feed_titles(client, user.id) == fanned_out
+
+def test_remove_subscription_drops_archived_articles(client, user, feeds):
+    response = client.post(f'/api/users/{user.id}/subscriptions', json={'category': 'eco'})
+    subscription_id = response.get_json()['id']
+    client.post('/api/news/fetch', json={'source_type': 'rss', 'rss_url': 'a'})
+    client.post('/api/news/fetch', json={'source_type': 'rss', 'rss_url': 'b'})
+
+    response = client.post('/api/news/archive', json={'retention_days': 1})
+    assert response.get_json()['archived'] == 2
+    assert _feed_titles(client, user.id) == ['B 30', 'B 40', 'A 1', 'A 2']
+
+    client.delete(f'/api/users/{user.id}/subscriptions/{subscription_id}')
+    assert _feed_titles(client, user.id) == []
+
+def test_remove_subscription_keeps_articles_covered_by_another(client, user, feeds):
+    eco = client.post(f'/api/users/{user.id}/subscriptions', json={'category': 'eco'}).get_json()
+    client.post(f'/api/users/{user.id}/subscriptions', json={'category': 'otra'})
+    client.post('/api/news/fetch', json={'source_type': 'rss', 'rss_url': 'a'})
+
+    db.session.add(UserSubscription(user_id=user.id, category='eco'))
+    db.session.commit()
+    client.delete(f'/api/users/{user.id}/subscriptions/{eco["id"]}')
+    assert _feed_titles(client, user.id) == ['A 1', 'A 2']
@@ -0,0 +1,107 @@
+from collections import Counter
+from datetime import datetime, timedelta
+import random
+
+import pytest
+
+from src.models.user import db
+from src.models.news import NewsArticle, TrendCounter
+from src.services.trend_service import TrendService
+
+START = datetime(2025, 6, 10, 12, 30)
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Reloj controlable para `datetime.utcnow()` dentro de trend_service"""
+    now = [START]
+
+    class FakeDateTime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return now[0]
+
+    monkeypatch.setattr('src.services.trend_service.datetime', FakeDateTime)
+    return now
+
+@pytest.fixture
+def service(app):
+    service = TrendService()
+    service.CACHE_TTL = 0
+    return service
+
+def _article(source, category, keywords, published_at):
+    return NewsArticle(title='t', source_name=source, category=category,
+                       keywords=','.join(keywords), published_at=published_at)
+
+def _record(service, articles):
+    service.record(articles)
+    db.session.commit()
+
+def test_top_counts_articles_in_window(service, clock):
+    _record(service, [
+        _article('Eco', 'economía', ['bolsa'], START - timedelta(minutes=10)),
+        _article('Eco', 'economía', ['bolsa', 'ibex'], START - timedelta(hours=3)),
+        _article('Deportes Hoy', 'deportes', ['liga'], START - timedelta(hours=30)),
+    ])
+
+    assert service.top('source', hours=1) == [{'key': 'Eco', 'count': 1}]
+    assert service.top('term', hours=6) == [{'key': 'bolsa', 'count': 2}, {'key': 'ibex', 'count': 1}]
+    assert service.top('category', hours=72) == [
+        {'key': 'economía', 'count': 2}, {'key': 'deportes', 'count': 1}
+    ]
+
+def test_hours_leave_the_window(service, clock):
+    _record(service, [_article('Eco', None, [], START)])
+
+    clock[0] = START + timedelta(hours=1)
+    assert service.top('source', hours=1) == []
+    assert service.top('source', hours=6) == [{'key': 'Eco', 'count': 1}]
+
+    clock[0] = START + timedelta(hours=168)
+    assert service.top('source', hours=168) == []
+    # Los contadores fuera de la ventana más larga se borran en el siguiente registro
+    _record(service, [])
+    assert TrendCounter.query.count() == 0
+
+def test_window_for_rounds_up_to_supported_window(service):
+    assert service.window_for(1) == 1
+    assert service.window_for(2) == 6
+    assert service.window_for(48) == 72
+    assert service.window_for(1000) == 168
+
+def test_rolling_totals_match_recount(service, clock):
+    """
+    Simulación aleatoria: tras cada paso, el top de cada ventana coincide con
+    contar desde cero las horas de los artículos registrados
+    """
+    rng = random.Random(7)
+    sources = [f'Fuente {i}' for i in range(6)]
+    terms = [f'término{i}' for i in range(10)]
+    log = []
+
+    for step in range(300):
+        clock[0] += timedelta(minutes=rng.choice([0, 5, 30, 60, 90, 240, 600]))
+        now = clock[0]
+
+        articles = []
+        for _ in range(rng.randint(0, 4)):
+            published_at = now - timedelta(minutes=rng.randint(-30, 200 * 60))
+            articles.append(_article(rng.choice(sources), None, rng.sample(terms, 2), published_at))
+        _record(service, articles)
+
+        current = now.replace(minute=0, second=0, microsecond=0)
+        oldest = current - timedelta(hours=TrendService.WINDOWS[-1] - 1)
+        for article in articles:
+            bucket = min(article.published_at, now).replace(minute=0, second=0, microsecond=0)
+            if bucket >= oldest:
+                log.append(('source', article.source_name, bucket))
+                log.extend(('term', term, bucket) for term in article.keywords.split(','))
+
+        if step % 10:
+            continue
+        for hours in TrendService.WINDOWS:
+            since = current - timedelta(hours=hours - 1)
+            for dimension in ('source', 'term'):
+                expected = Counter(key for dim, key, bucket in log if dim == dimension and bucket >= since)
+                top = service.top(dimension, hours=hours, limit=50)
+                assert {row['key']: row['count'] for row in top} == dict(expected), (step, hours, dimension)